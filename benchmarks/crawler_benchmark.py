@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import json
+import time
+from .fake_youtube import start_server
+from framework.crawler import AsyncChannelCrawler
+
+'''
+crawler_benchmark.py
+    Measures the asyncio crawler against the local fake YouTube server, with injected latency,
+    throttling and errors. Results are reported to stdout, not to the data source.
+
+    Usage (from the project root):
+        python -m benchmarks.crawler_benchmark --items 2000 --latency 0.3 --throttle 200
+'''
+
+
+class ListSource():
+    """Minimal in-memory data source."""
+
+    def __init__(self, items: list):
+        self.items = items
+        self.current_item = None
+
+    def __iter__(self):
+        for item in self.items:
+            self.current_item = item
+            yield item
+
+    def suspend(self):
+        return self.current_item
+
+    def resume(self, token):
+        self.current_item = token
+
+
+async def crawl(crawler: AsyncChannelCrawler, source: ListSource) -> dict:
+    outcomes = {"success": 0, "business": 0, "system": 0}
+    async for _, _, data, error in crawler.results(source):
+        if error is None:
+            outcomes["success"] += 1
+        elif type(error).__name__ == "BusinessException":
+            outcomes["business"] += 1
+        else:
+            outcomes["system"] += 1
+    return outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--missing-every", type=int, default=10,
+                        help="Every Nth channel doesn't exist (404).")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=500.0)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--throttle", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency, jitter=args.jitter,
+                          throttle=args.throttle, error_rate=args.error_rate)
+    items = [{"channel": f"broken{n}" if args.missing_every and n % args.missing_every == 0 else f"channel{n}"}
+             for n in range(args.items)]
+    crawler = AsyncChannelCrawler(server.url, concurrency=args.concurrency,
+                                  rate=args.rate, burst=args.concurrency,
+                                  backoff=0.2, max_backoff=5.0)
+    started = time.perf_counter()
+    outcomes = asyncio.run(crawl(crawler, ListSource(items)))
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    print(json.dumps({
+        "items": args.items,
+        "seconds": round(elapsed, 3),
+        "items_per_second": round(args.items / elapsed, 1),
+        "outcomes": outcomes,
+        "requests": crawler.requests,
+        "retries": crawler.retries,
+        "server_throttled": server.throttled,
+        "settings": vars(args),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+'''
+e2e_benchmark.py
+    Runs bot.action() end to end, offline, and measures it. The Orchestrator is a FakeMaestro with
+    a configurable latency, the browser is a FakeWebBot (or the "http" extraction engine) and the
+    channel pages come from the local fake YouTube server, with 404s, slow and hanging pages.
+    Each scenario (data source x number of items) runs in a fresh interpreter and working folder,
+    and reports items/s, per-item latency percentiles, peak RSS and the Orchestrator call counts.
+
+    Usage (from the project root):
+        python -m benchmarks.e2e_benchmark --sizes 10,1000,100000 --sources csv,datapool --output e2e.json
+        python -m benchmarks.e2e_benchmark --sizes 1000 --compare e2e.json
+    The per-item latency goes from the start of process_item() to the report of its outcome.
+'''
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCES = ("csv", "datapool", "prefetch")
+DATAPOOL_LABEL = "Benchmark"
+
+
+def channel_handles(count: int, missing_every: int, slow_every: int, hang_every: int) -> list:
+    """
+    Channel handles of a scenario. Every Nth is missing (404), slow or hanging, see fake_youtube.py.
+    """
+    handles = []
+    for n in range(1, count + 1):
+        if hang_every and n % hang_every == 0:
+            handles.append(f"hang{n}")
+        elif slow_every and n % slow_every == 0:
+            handles.append(f"slow{n}")
+        elif missing_every and n % missing_every == 0:
+            handles.append(f"broken{n}")
+        else:
+            handles.append(f"channel{n}")
+    return handles
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+        # Kilobytes on Linux, bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024 ** 2
+    except ImportError:
+        return psutil.Process().memory_info().peak_wset / 1024 ** 2 if psutil else 0.0
+
+
+def timed(function, latencies: list, starts: threading.local):
+    """
+    Wraps an outcome handler so the time since the item started is recorded when it is reported.
+    """
+    def wrapper(*args, **kwargs):
+        try:
+            return function(*args, **kwargs)
+        finally:
+            started = getattr(starts, "item", None)
+            starts.item = None
+            if started is not None:
+                latencies.append(time.perf_counter() - started)
+    return wrapper
+
+
+def run_scenario(args) -> dict:
+    """
+    Runs one scenario in this interpreter. Must be called in an empty working folder, before
+    the framework is imported, because the framework writes to ./output, ./temp and ./cache.
+    """
+    from .fake_youtube import start_server
+    from .fakes import FakeDesktopBot, FakeMaestro, FakeWebBot
+
+    handles = channel_handles(args.items, args.missing_every, args.slow_every, args.hang_every)
+    server = start_server(latency=args.page_latency, slow=args.slow, hang=args.hang)
+    maestro = FakeMaestro(latency=args.maestro_latency)
+
+    sys.path.insert(0, str(ROOT))
+    import bot
+    import framework.initialize
+    import framework.process
+    import framework.workers
+    from framework.datasources import (CSVSource, DatapoolSource,
+                                       PrefetchingDatapoolSource, data_source)
+    from framework.extraction import HttpChannelExtractor
+    from framework.readiness import percentile
+    from framework.recovery import recovery
+    from framework.state import STATE
+
+    STATE.maestro = maestro
+    STATE.task_id = "benchmark"
+    STATE.execution = maestro.get_execution(STATE.task_id)
+
+    if args.source == "csv":
+        with open("channels.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["channel"])
+            writer.writerows([handle] for handle in handles)
+        data_source.configure(lambda: CSVSource("channels.csv"))
+    else:
+        maestro.add_datapool(DATAPOOL_LABEL, [{"channel": handle} for handle in handles])
+        if args.source == "prefetch":
+            data_source.configure(lambda: PrefetchingDatapoolSource(DATAPOOL_LABEL))
+        else:
+            data_source.configure(lambda: DatapoolSource(DATAPOOL_LABEL))
+
+    def init_webbot():
+        STATE.webbot = FakeWebBot(page_load_timeout=args.page_timeout)
+
+    def init_desktopbot():
+        STATE.desktopbot = FakeDesktopBot()
+
+    for module in (framework.initialize, framework.workers):
+        module.init_webbot = init_webbot
+        module.init_desktopbot = init_desktopbot
+    framework.process.YOUTUBE_URL = server.url
+    framework.process.EXTRACTION_ENGINE = args.engine
+    framework.process.http_extractor = HttpChannelExtractor(server.url, timeout=args.page_timeout)
+
+    latencies = []
+    # Start of the item being processed, per worker thread
+    starts = threading.local()
+    process_item = framework.process.process_item
+
+    def timed_process_item(item):
+        starts.item = time.perf_counter()
+        return process_item(item)
+
+    for module in (bot, framework.workers):
+        module.process_item = timed_process_item
+        for name in ("register_success", "handle_business_exception",
+                     "handle_system_exception", "handle_interrupt_requested"):
+            setattr(module, name, timed(getattr(module, name), latencies, starts))
+    bot.WORKERS = args.workers
+
+    started = time.perf_counter()
+    bot.action()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "source": args.source,
+        "engine": args.engine,
+        "items": args.items,
+        "processed": STATE.total_items,
+        "success": STATE.success_count,
+        "errors": STATE.error_count,
+        "seconds": round(elapsed, 3),
+        "items_per_second": round(STATE.total_items / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {name: round(percentile(latencies_ms, q), 2)
+                       for name, q in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))},
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "maestro_calls": dict(sorted(maestro.calls.items())),
+        "maestro_calls_total": sum(maestro.calls.values()),
+        "page_requests": server.requests,
+        "recoveries": dict(recovery.counts),
+    }
+
+
+def scenario_command(args, source: str, items: int, result_file: str) -> list:
+    return [sys.executable, "-m", "benchmarks.e2e_benchmark", "--scenario",
+            "--source", source, "--items", str(items), "--engine", args.engine,
+            "--maestro-latency", str(args.maestro_latency), "--page-latency", str(args.page_latency),
+            "--page-timeout", str(args.page_timeout), "--missing-every", str(args.missing_every),
+            "--slow-every", str(args.slow_every), "--slow", str(args.slow),
+            "--hang-every", str(args.hang_every), "--hang", str(args.hang),
+            "--workers", str(args.workers), "--result-file", result_file]
+
+
+def compare(results: list, previous_file: str):
+    """
+    Prints the change of items/s and p95 latency against a previous run.
+    """
+    previous = {(r["source"], r["engine"], r["items"]): r
+                for r in json.loads(Path(previous_file).read_text(encoding="utf-8"))["results"]}
+    for result in results:
+        before = previous.get((result["source"], result["engine"], result["items"]))
+        if not before:
+            continue
+        print(f"{result['source']:>9} {result['items']:>7} items: "
+              f"{before['items_per_second']:>9.1f} -> {result['items_per_second']:>9.1f} items/s, "
+              f"p95 {before['latency_ms']['p95']:>8.1f} -> {result['latency_ms']['p95']:>8.1f} ms",
+              file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10,1000,100000",
+                        help="Comma-separated numbers of items.")
+    parser.add_argument("--sources", default="csv,datapool",
+                        help=f"Comma-separated data sources: {', '.join(SOURCES)}.")
+    parser.add_argument("--engine", default="webbot", choices=["webbot", "http"])
+    parser.add_argument("--maestro-latency", type=float, default=0.005,
+                        help="Seconds each Orchestrator call takes.")
+    parser.add_argument("--page-latency", type=float, default=0.0,
+                        help="Seconds added to every page response.")
+    parser.add_argument("--page-timeout", type=float, default=2.0,
+                        help="Page load timeout of the fake browser, in seconds.")
+    parser.add_argument("--missing-every", type=int, default=10,
+                        help="Every Nth channel doesn't exist (404).")
+    parser.add_argument("--slow-every", type=int, default=1000,
+                        help="Every Nth channel page is answered after --slow seconds.")
+    parser.add_argument("--slow", type=float, default=0.3)
+    parser.add_argument("--hang-every", type=int, default=5000,
+                        help="Every Nth channel page hangs past the page load timeout.")
+    parser.add_argument("--hang", type=float, default=30.0)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Parallel fake browsers (WORKERS in bot.py).")
+    parser.add_argument("--output", help="Writes the results to this JSON file.")
+    parser.add_argument("--compare", help="Previous JSON results to compare against.")
+    # Internal: runs a single scenario in this process
+    parser.add_argument("--scenario", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--source", default="csv", help=argparse.SUPPRESS)
+    parser.add_argument("--items", type=int, default=10, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        with tempfile.TemporaryDirectory(prefix="e2e-benchmark-") as folder:
+            os.chdir(folder)
+            result = run_scenario(args)
+            os.chdir(ROOT)
+        Path(args.result_file).write_text(json.dumps(result), encoding="utf-8")
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="e2e-results-") as folder:
+        for source in args.sources.split(","):
+            for items in (int(size) for size in args.sizes.split(",")):
+                result_file = str(Path(folder) / f"{source}-{items}.json")
+                print(f"Running {source} with {items} items...", file=sys.stderr)
+                # The bot's own output (finish message, warnings) is discarded
+                completed = subprocess.run(scenario_command(args, source, items, result_file),
+                                           cwd=ROOT, stdout=subprocess.DEVNULL,
+                                           stderr=subprocess.PIPE, text=True)
+                if completed.returncode != 0:
+                    print(completed.stderr, file=sys.stderr)
+                    raise SystemExit(f"Scenario {source} x {items} failed.")
+                results.append(json.loads(Path(result_file).read_text(encoding="utf-8")))
+
+    report = {"config": {key: value for key, value in vars(args).items()
+                         if key not in ("scenario", "source", "items", "result_file",
+                                        "output", "compare")},
+              "results": results}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+'''
+fake_youtube.py
+    Local stand-in for YouTube channel pages, to exercise the extraction engines offline.
+    - GET /@<handle> serves <pages>/<handle>.html when a saved page exists, otherwise a
+      synthesized page with deterministic counts.
+    - Handles that aren't valid YouTube handles, or that start with "broken", get a 404 page.
+    - Handles that start with "slow" are answered after --slow seconds, and handles that start
+      with "hang" after --hang seconds (long enough to hit the client's page load timeout).
+    - --latency and --jitter delay every response.
+    - --throttle answers 429 (with Retry-After) above that many requests per second, and
+      --error-rate answers 503 to that fraction of the requests.
+
+    Usage:
+        python -m benchmarks.fake_youtube --port 8765 --pages ./saved-pages
+        Then point the framework at it: HttpChannelExtractor("http://127.0.0.1:8765")
+        Or from Python: server = start_server(latency=0.2); ...; server.shutdown()
+'''
+
+HANDLE_PATTERN = re.compile(r"^[A-Za-z0-9._-]{3,30}$")
+
+NOT_FOUND_PAGE = "<html><head><title>404 Not Found</title></head><body>404 Not Found</body></html>"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>{handle} - YouTube</title></head>
+<body>
+<yt-content-metadata-view-model class="yt-page-header-view-model__page-header-content-metadata yt-content-metadata-view-model yt-content-metadata-view-model--inline yt-content-metadata-view-model--medium-text">
+<div>@{handle}</div><div>{subscribers}</div><span>•</span><div>{videos}</div>
+</yt-content-metadata-view-model>
+<script nonce="fake">var ytInitialData = {data};</script>
+</body></html>
+"""
+
+
+def abbreviate(n: int) -> str:
+    """
+    Formats a count the way YouTube does ("1.2M", "3.4K", "999").
+    """
+    for size, suffix in ((1_000_000_000, "B"), (1_000_000, "M"), (1_000, "K")):
+        if n >= size:
+            value = f"{n / size:.1f}".rstrip("0").rstrip(".")
+            return f"{value}{suffix}"
+    return str(n)
+
+
+def channel_counts(handle: str) -> tuple:
+    """
+    Returns deterministic (subscribers, videos) counts for a handle.
+    """
+    digest = hashlib.blake2b(handle.lower().encode(), digest_size=8).digest()
+    return (int.from_bytes(digest[:4], "big") % 50_000_000,
+            int.from_bytes(digest[4:], "big") % 20_000)
+
+
+def channel_page(handle: str) -> str:
+    """
+    Synthesizes a channel page with the metadata both in the DOM and in ytInitialData.
+    """
+    subscribers, videos = channel_counts(handle)
+    texts = [f"@{handle}", f"{abbreviate(subscribers)} subscribers",
+             f"{abbreviate(videos)} videos"]
+    data = {"header": {"pageHeaderRenderer": {"content": {"pageHeaderViewModel": {"metadata": {
+        "contentMetadataViewModel": {"metadataRows": [
+            {"metadataParts": [{"text": {"content": texts[0]}}]},
+            {"metadataParts": [{"text": {"content": texts[1]}},
+                               {"text": {"content": texts[2]}}]},
+        ]}}}}}}}
+    return PAGE_TEMPLATE.format(handle=handle, subscribers=texts[1],
+                                videos=texts[2], data=json.dumps(data))
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in one segment: with separate small writes, Nagle's algorithm and
+    # the client's delayed ACK add ~40 ms to every keep-alive response
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server._lock:
+            server.requests += 1
+        delay = server.latency + random.uniform(0, server.jitter)
+        if delay:
+            time.sleep(delay)
+        if server.throttle and not server.allow():
+            with server._lock:
+                server.throttled += 1
+            return self.respond(429, "Too Many Requests", {"Retry-After": "1"})
+        if server.error_rate and random.random() < server.error_rate:
+            return self.respond(503, "Service Unavailable")
+        path = unquote(urlsplit(self.path).path)
+        if not path.startswith("/@"):
+            return self.respond(404, NOT_FOUND_PAGE)
+        handle = path[2:]
+        if handle.startswith("slow"):
+            time.sleep(server.slow)
+        elif handle.startswith("hang"):
+            time.sleep(server.hang)
+        saved = Path(server.pages_dir) / f"{handle}.html" if server.pages_dir else None
+        if saved and saved.is_file():
+            return self.respond(200, saved.read_text(encoding="utf-8"))
+        if not HANDLE_PATTERN.match(handle) or handle.startswith("broken"):
+            return self.respond(404, NOT_FOUND_PAGE)
+        return self.respond(200, channel_page(handle))
+
+    def respond(self, status: int, body: str, headers: dict = None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        ...
+
+
+class FakeYouTubeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, pages_dir: str = None, latency: float = 0.0,
+                 jitter: float = 0.0, throttle: float = 0.0, error_rate: float = 0.0,
+                 slow: float = 2.0, hang: float = 60.0):
+        super().__init__(address, FakeYouTubeHandler)
+        self.pages_dir = pages_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle = throttle
+        self.error_rate = error_rate
+        self.slow = slow
+        self.hang = hang
+        self.requests = 0
+        self.throttled = 0
+        self._tokens = throttle
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Token bucket of the --throttle limit (burst of one second worth of requests).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.throttle, self._tokens +
+                               (now - self._refilled) * self.throttle)
+            self._refilled = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections are expected, don't print them
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_port}"
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, pages_dir: str = None,
+                 latency: float = 0.0, jitter: float = 0.0, throttle: float = 0.0,
+                 error_rate: float = 0.0, slow: float = 2.0, hang: float = 60.0) -> FakeYouTubeServer:
+    """
+    Starts the server on a background thread. Port 0 picks a free port.
+    Returns: The server. Its base URL is server.url.
+    """
+    server = FakeYouTubeServer((host, port), pages_dir, latency, jitter,
+                               throttle, error_rate, slow, hang)
+    threading.Thread(target=server.serve_forever, daemon=True,
+                     name="fake-youtube").start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", help="Folder of saved channel pages named <handle>.html.")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Random extra seconds (0 to jitter) added to every response.")
+    parser.add_argument("--throttle", type=float, default=0.0,
+                        help="Requests per second above which 429 is answered. 0 disables it.")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with 503.")
+    parser.add_argument("--slow", type=float, default=2.0,
+                        help="Seconds added to the responses of handles starting with \"slow\".")
+    parser.add_argument("--hang", type=float, default=60.0,
+                        help="Seconds added to the responses of handles starting with \"hang\".")
+    args = parser.parse_args()
+    server = start_server(args.host, args.port, args.pages, args.latency,
+                          args.jitter, args.throttle, args.error_rate, args.slow, args.hang)
+    print(f"Serving fake YouTube at {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
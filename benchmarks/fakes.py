@@ -0,0 +1,184 @@
+import base64
+import html
+import re
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import requests
+
+'''
+fakes.py
+    Offline stand-ins for the services the automation talks to, used by the end-to-end benchmark:
+    - FakeMaestro: BotMaestroSDK that answers every call after `latency` seconds and counts them.
+      Datapools registered with add_datapool() are served by get_datapool().
+    - FakeWebBot: WebBot that loads pages over plain HTTP (e.g. from the fake YouTube server)
+      and exposes the small part of the Selenium driver the framework uses.
+    - FakeDesktopBot: DesktopBot whose screenshots are empty files.
+'''
+
+TITLE_PATTERN = re.compile(r"<title>(.*?)</title>", re.S)
+METADATA_PATTERN = re.compile(r"<yt-content-metadata-view-model[^>]*>(.*?)</yt-content-metadata-view-model>", re.S)
+TEXT_PATTERN = re.compile(r"<(div|span)>(.*?)</\1>", re.S)
+# 1x1 PNG returned as the screenshot of every page
+SCREENSHOT_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg==")
+
+
+class FakeMaestro():
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Seconds every call takes.
+        """
+        self.latency = latency
+        self.calls = Counter()
+        self.datapools = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str):
+        with self._lock:
+            self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def add_datapool(self, label: str, items: list):
+        self.datapools[label] = FakeDatapool(self, label, items)
+
+    def get_datapool(self, label: str):
+        self.record("get_datapool")
+        return self.datapools[label]
+
+    def get_task(self, task_id):
+        self.record("get_task")
+        return SimpleNamespace(id=task_id, activity_name="Benchmark",
+                               is_interrupted=lambda: False)
+
+    def get_execution(self, task_id=None):
+        self.record("get_execution")
+        return SimpleNamespace(task_id=task_id, parameters={})
+
+    def __getattr__(self, name):
+        # alert, error, new_log, new_log_entry, post_artifact, finish_task...
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            self.record(name)
+        return call
+
+
+class FakeDatapool():
+    def __init__(self, maestro: FakeMaestro, label: str, items: list):
+        self.maestro = maestro
+        self.label = label
+        self.items = items
+        self.position = 0
+        self._lock = threading.Lock()
+
+    def is_active(self) -> bool:
+        self.maestro.record("datapool.is_active")
+        return True
+
+    def has_next(self) -> bool:
+        self.maestro.record("datapool.has_next")
+        return self.position < len(self.items)
+
+    def next(self, task_id):
+        self.maestro.record("datapool.next")
+        with self._lock:
+            if self.position >= len(self.items):
+                return None
+            values = self.items[self.position]
+            self.position += 1
+        return FakeEntry(self.maestro, values)
+
+
+class FakeEntry():
+    def __init__(self, maestro: FakeMaestro, values: dict):
+        self.maestro = maestro
+        self.values = values
+
+    def report_done(self, *args, **kwargs):
+        self.maestro.record("entry.report_done")
+
+    def report_error(self, *args, **kwargs):
+        self.maestro.record("entry.report_error")
+
+
+class FakeElement():
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeDriver():
+    """
+    Minimal Selenium driver: one window whose page is fetched with requests.
+    """
+
+    def __init__(self, page_load_timeout: float):
+        self.page_load_timeout = page_load_timeout
+        self.session = requests.Session()
+        self.current_url = "about:blank"
+        self.title = ""
+        self.metadata = ""
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.switch_to = SimpleNamespace(window=lambda handle: None,
+                                         new_window=lambda kind: None)
+
+    def get(self, url: str):
+        # Imported here like in the framework, Selenium is slow to import
+        from selenium.common.exceptions import TimeoutException
+
+        self.current_url = url
+        self.title = ""
+        self.metadata = ""
+        if url == "about:blank":
+            return
+        try:
+            response = self.session.get(url, timeout=self.page_load_timeout)
+        except requests.Timeout:
+            raise TimeoutException(f"Timed out loading {url}")
+        title = TITLE_PATTERN.search(response.text)
+        self.title = html.unescape(title.group(1)) if title else ""
+        metadata = METADATA_PATTERN.search(response.text)
+        if metadata:
+            self.metadata = "\n".join(html.unescape(text)
+                                      for _, text in TEXT_PATTERN.findall(metadata.group(1)))
+
+    def find_elements(self, by, selector):
+        return [FakeElement(self.metadata)] if self.metadata else []
+
+    def execute_script(self, script, *args):
+        return 0
+
+    def get_screenshot_as_png(self) -> bytes:
+        return SCREENSHOT_PNG
+
+    def delete_all_cookies(self):
+        self.session.cookies.clear()
+
+    def close(self):
+        ...
+
+    def quit(self):
+        self.session.close()
+
+
+class FakeWebBot():
+    def __init__(self, page_load_timeout: float = 30.0):
+        self.driver = FakeDriver(page_load_timeout)
+
+    def browse(self, url: str):
+        self.driver.get(url)
+
+    def stop_browser(self):
+        self.driver.quit()
+
+
+class FakeDesktopBot():
+    def save_screenshot(self, path):
+        with open(path, "wb"):
+            ...
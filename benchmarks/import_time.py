@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+'''
+import_time.py
+    Measures the startup cost of the bot: the time to import bot.py, and the modules that take
+    most of it according to `python -X importtime`. Nothing is connected or read on import, so
+    this is the fixed cost every task pays before its first item.
+
+    Usage (from the project root):
+        python -m benchmarks.import_time --runs 10 --top 15
+        python -m benchmarks.import_time --budget-ms 500   # exits with 1 above the budget
+'''
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_import(module: str, importtime: bool = False) -> tuple:
+    """
+    Imports module in a fresh interpreter.
+    Returns: (wall time in seconds, stderr of the interpreter)
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", f"import {module}"]
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True,
+                               env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"))
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+    return elapsed, completed.stderr
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Returns: list of (module, self us, cumulative us, depth) from -X importtime output.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules.append((name, int(own), int(cumulative), len(indent) // 2))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="bot")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Fresh interpreters timed, the median is reported.")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Slowest modules to list, by cumulative import time.")
+    parser.add_argument("--budget-ms", type=float, default=0.0,
+                        help="Fails (exit code 1) when the import of --module takes longer.")
+    args = parser.parse_args()
+
+    baseline = statistics.median(run_import("sys")[0] for _ in range(args.runs))
+    wall = statistics.median(run_import(args.module)[0] for _ in range(args.runs))
+    modules = parse_importtime(run_import(args.module, importtime=True)[1])
+    # -X importtime prints the imports of a module before the module itself
+    end = next(index for index, m in enumerate(modules) if m[0] == args.module and m[3] == 0)
+    start = end
+    while start > 0 and modules[start - 1][3] > 0:
+        start -= 1
+    subtree = modules[start:end]
+    target = modules[end][2]
+    slowest = sorted(subtree, key=lambda m: m[2], reverse=True)[:args.top]
+
+    result = {
+        "module": args.module,
+        "import_ms": round(target / 1000, 1),
+        "wall_ms": round(wall * 1000, 1),
+        "interpreter_ms": round(baseline * 1000, 1),
+        "modules_imported": len(subtree) + 1,
+        "slowest": [{"module": name, "cumulative_ms": round(cumulative / 1000, 1),
+                     "self_ms": round(own / 1000, 1)}
+                    for name, own, cumulative, _ in slowest],
+    }
+    print(json.dumps(result, indent=2))
+    if args.budget_ms and result["import_ms"] > args.budget_ms:
+        print(f"import {args.module} took {result['import_ms']} ms, over the budget of {args.budget_ms:g} ms.",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+'''
+logging_overhead.py
+    Measures the time the item thread spends logging, per item, for each logging setup
+    (framework/logger.py): LOG_MODE "sync" or "queue", LOG_FORMAT "text" or "json". Each item logs
+    what a scraped channel logs (started, page ready, success), through the framework's loggers.
+    --debug sets one module to DEBUG, as when a single module is investigated.
+    Each setup runs in a fresh interpreter, in a temporary folder.
+
+    Usage (from the project root):
+        python -m benchmarks.logging_overhead --items 20000
+        python -m benchmarks.logging_overhead --debug framework.readiness --budget-us 200   # exits with 1 above the budget
+'''
+
+ROOT = Path(__file__).resolve().parent.parent
+SETUPS = ["sync,text", "sync,json", "queue,text", "queue,json"]
+
+
+def run_setup(args) -> dict:
+    """
+    Logs --items items with the logging setup of --setup, in the current folder.
+    Returns: Overhead per item, in microseconds.
+    """
+    import logging
+    import framework.logger as log
+    from framework.state import STATE
+
+    mode, log_format = args.setup.split(",")
+    log.LOG_MODE = mode
+    log.LOG_FORMAT = log_format
+    if args.debug:
+        log.LOG_LEVELS = dict(log.LOG_LEVELS, **{args.debug: "DEBUG"})
+    STATE.task_id = "benchmark"
+    Path("output").mkdir()
+    log.setup_logger()
+
+    process = logging.getLogger("framework.process")
+    readiness = logging.getLogger("framework.readiness")
+    status = logging.getLogger("framework.status_handling")
+    timings = []
+    for index in range(args.items):
+        channel = f"channel{index}"
+        STATE.item = {"channel": channel}
+        started = time.perf_counter()
+        process.info("Item processing has started: %s.", channel)
+        readiness.debug("Page ready (%s): %s", "element", {"title": 0.41, "element": 0.87})
+        status.info("Item processing successful: %s",
+                    f"Item processed successfuly: Channel: {channel}, subscribers: 1234, videos: 56")
+        timings.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    log.stop_logging()
+    drain = time.perf_counter() - started
+    timings.sort()
+    return {
+        "setup": args.setup,
+        "items": args.items,
+        "per_item_us": {
+            "p50": round(statistics.median(timings) * 1e6, 1),
+            "p99": round(timings[int(len(timings) * 0.99)] * 1e6, 1),
+            "mean": round(statistics.fmean(timings) * 1e6, 1),
+        },
+        "drain_ms": round(drain * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--setups", default=";".join(SETUPS),
+                        help="Logging setups (mode,format) measured, separated by ';'.")
+    parser.add_argument("--debug", default="",
+                        help="Logger name set to DEBUG, e.g. framework.readiness.")
+    parser.add_argument("--budget-us", type=float, default=0.0,
+                        help="Fails (exit code 1) when the mean per item of a queue setup is higher.")
+    # Internal: runs a single setup, in the current folder
+    parser.add_argument("--setup", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.setup:
+        result = run_setup(args)
+        Path(args.result_file).write_text(json.dumps(result), encoding="utf-8")
+        return
+
+    results = []
+    for setup in args.setups.split(";"):
+        with tempfile.TemporaryDirectory(prefix="logging-benchmark-") as folder:
+            result_file = Path(folder) / "result.json"
+            command = [sys.executable, "-m", "benchmarks.logging_overhead", "--setup", setup,
+                       "--items", str(args.items), "--debug", args.debug,
+                       "--result-file", str(result_file)]
+            subprocess.run(command, cwd=folder, check=True,
+                           env=dict(os.environ, PYTHONPATH=str(ROOT)))
+            results.append(json.loads(result_file.read_text(encoding="utf-8")))
+    print(json.dumps({"debug": args.debug or None, "results": results}, indent=2))
+
+    over = [r for r in results
+            if r["setup"].startswith("queue") and r["per_item_us"]["mean"] > args.budget_us]
+    if args.budget_us and over:
+        for r in over:
+            print(f"Logging setup {r['setup']} took {r['per_item_us']['mean']} us per item, "
+                  f"over the budget of {args.budget_us:g} us.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,10 @@ from framework.process import process_item
 from framework.datasources import *
 from framework.initialize import initialize
 from framework.finalize import cleanup, finalize
+from framework.workers import run_worker_pool
+from framework.recovery import recovery
+from framework.retry import retry_scheduler
+from framework.metrics import metrics
 import time
 
 logger = logging.getLogger(__name__)
@@ -18,33 +22,60 @@ To customize your automation:
 - Adjust initialization settings in framework/initialize.py
 - Configure your data source in framework/datasources.py
 - Add your automation steps in the process_item() function located in framework/process.py
+- Set WORKERS to process items with several browsers in parallel (framework/workers.py)
+- Set ASYNC_CRAWLER to crawl the channels over HTTP without browsers (framework/crawler.py)
 
 The BeaPro framework automatically handles:
-- System exceptions (technical failures with restart capability)
+- System exceptions (technical failures with tiered recovery, up to a browser restart)
 - Interruption requests from BotCity Orchestrator
 - Success/error reporting and alerting
 - Logging, and more. Read the Readme.md for more information.
 """
 
+# Number of parallel WebBot sessions. With 1, items are processed one at a time in this thread.
+WORKERS = 1
+# Browserless mode: crawls the channel pages concurrently over HTTP with asyncio.
+ASYNC_CRAWLER = False
+
 
 def action():
+    # Connects to the Orchestrator. Nothing is done on import, see framework/state.py
+    STATE.connect()
     try:
+        if ASYNC_CRAWLER:
+            # Imported only when used: aiohttp is slow to import
+            from framework.crawler import run_crawler
+            run_crawler()
+            return
+
+        if WORKERS > 1:
+            run_worker_pool(WORKERS)
+            return
+
         initialize()
 
-        for item in data_source:
+        # Items that fail with a system error come back after a delay, see framework/retry.py
+        for item in retry_scheduler.items(data_source):
 
+            metrics.item_started(item)
             try:
-                result_message = process_item(item)
+                result = process_item(item)
             except InterruptException as ex:
                 handle_interrupt_requested(ex)
             except BusinessException as ex:
+                retry_scheduler.record(item)
                 handle_business_exception(ex)
+                recovery.reset()
             except (SystemException, Exception) as ex:
-                handle_system_exception(ex)
-                initialize(restart=True)
+                if not retry_scheduler.retry(item, ex):
+                    handle_system_exception(ex)
+                metrics.recovered(recovery.recover())
             else:
+                retry_scheduler.record(item)
                 register_success(
-                    f"Item processed successfuly: {result_message}")
+                    f"Item processed successfuly: {result}", result)
+                recovery.reset()
+            metrics.sample_browser(STATE.webbot)
 
     except Exception as ex:
         logger.error(f"Error: {ex}")
@@ -1,4 +1,4 @@
 Set-Location -Path (Resolve-Path "$PSScriptRoot\..")
-$exclude = @("venv", ".env", ".gitignore", "temp", "output", "build", "bot-YoutubeChannel-Datapool.zip")
+$exclude = @("venv", ".env", ".gitignore", "temp", "output", "checkpoints", "cache", "build", "bot-YoutubeChannel-Datapool.zip")
 $files = Get-ChildItem -Path . -Exclude $exclude
 Compress-Archive -Path $files -DestinationPath "bot-YoutubeChannel-Datapool.zip" -Force
\ No newline at end of file
@@ -1,3 +1,3 @@
 #!/bin/bash
 
-zip -r "bot-YoutubeChannel-Datapool.zip" * -x "bot-YoutubeChannel-Datapool.zip", "venv", ".env", ".gitignore", "temp", "output"
+zip -r "bot-YoutubeChannel-Datapool.zip" * -x "bot-YoutubeChannel-Datapool.zip", "venv", ".env", ".gitignore", "temp", "output", "checkpoints", "cache"
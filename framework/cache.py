@@ -0,0 +1,148 @@
+import logging
+import sqlite3
+import threading
+import time
+from .preflight import normalize_handle
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+'''
+cache.py
+    Persistent result cache keyed by normalized channel handle, shared by every task on the machine.
+    - Stores channel_name, subscribers and videos with the time they were fetched.
+    - Entries expire after `ttl` seconds; confirmed "not found" channels after `negative_ttl`.
+    - Keeps at most `max_entries` rows, evicting the least recently used ones.
+    - The database is opened on first use, not on import.
+    Disabled by default, since cached counts can be up to `ttl` old: set result_cache at the
+    bottom of this file to enable it.
+'''
+
+NOT_FOUND = "NOT_FOUND"
+
+
+class ResultCache():
+    def __init__(self, path: str = "./cache/results.sqlite3", ttl: float = 6 * 3600,
+                 negative_ttl: float = 24 * 3600, max_entries: int = 100_000):
+        """
+        Args:
+            path: SQLite file. Keep it outside ./output, which is wiped on every task.
+            ttl: Seconds a fetched result is served from the cache.
+            negative_ttl: Seconds a "not found" channel is served from the cache.
+            max_entries: Maximum cached channels. The least recently used ones are evicted.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Opens the database on first use. Called with self._lock held.
+        """
+        if self._db is not None:
+            return self._db
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                handle TEXT PRIMARY KEY,
+                channel_name TEXT,
+                subscribers TEXT,
+                videos TEXT,
+                not_found INTEGER NOT NULL DEFAULT 0,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)")
+        self._db.commit()
+        return self._db
+
+    def __str__(self):
+        return f"Result cache {self.path}"
+
+    def get(self, channel):
+        """
+        Looks up a channel.
+        Returns: dict with channel_name, subscribers and videos; NOT_FOUND for a cached 404;
+        None on a miss or an expired entry.
+        """
+        handle = normalize_handle(channel)
+        now = time.time()
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT channel_name, subscribers, videos, not_found, fetched_at FROM results WHERE handle = ?",
+                (handle,)).fetchone()
+            ttl = self.negative_ttl if row and row[3] else self.ttl
+            if row is None or now - row[4] > ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute(
+                "UPDATE results SET accessed_at = ? WHERE handle = ?", (now, handle))
+            self._db.commit()
+        if row[3]:
+            return NOT_FOUND
+        return {"channel_name": row[0], "subscribers": row[1], "videos": row[2]}
+
+    def put(self, channel, data: dict):
+        """
+        Stores the metadata fetched for a channel.
+        """
+        self._put(channel, data["channel_name"],
+                  data["subscribers"], data["videos"], 0)
+
+    def put_not_found(self, channel):
+        """
+        Stores a confirmed "not found" channel.
+        """
+        self._put(channel, None, None, None, 1)
+
+    def _put(self, channel, channel_name, subscribers, videos, not_found):
+        now = time.time()
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_handle(channel), channel_name, subscribers, videos, not_found, now, now))
+            self._puts += 1
+            # Checking the size on every insert would cost a full count, so do it periodically
+            if self._puts % 100 == 1:
+                self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            # Evict a bit more than needed, so the next checks are no-ops
+            excess += self.max_entries // 10
+            self._db.execute(
+                "DELETE FROM results WHERE handle IN (SELECT handle FROM results ORDER BY accessed_at LIMIT ?)",
+                (excess,))
+            logger.info(f"{self}: evicted {excess} least recently used entries.")
+
+    def stats_message(self) -> str:
+        return f"Result cache: {self.hits} hits, {self.misses} misses."
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+"""
+Setting result cache: ResultCache | None
+"""
+
+# Hits report counts fetched up to `ttl` seconds earlier. To serve channels from the cache:
+# result_cache = ResultCache("./cache/results.sqlite3", ttl=6 * 3600)
+result_cache = None
@@ -0,0 +1,318 @@
+import aiohttp
+import asyncio
+import logging
+import random
+import time
+from .datasources import data_source
+from .cache import NOT_FOUND, result_cache
+from .exceptions import (BusinessException, InterruptException,
+                         InvalidInputException, NotFoundException,
+                         SystemException)
+from .extraction import (HEADERS, YOUTUBE_URL, ExtractionError,
+                         parse_channel_page)
+from .initialize import run_once
+from .preflight import preflight
+from .process import format_result
+from .state import STATE
+from .status_handling import (handle_business_exception,
+                              handle_interrupt_requested,
+                              handle_system_exception, register_success)
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+'''
+crawler.py
+    Browserless asyncio crawler for the channel pages.
+    Fetches many channels at once through a pooled keep-alive aiohttp session, limited by:
+        - concurrency: maximum requests in flight.
+        - rate/burst: token bucket per host (requests per second).
+        - Retries with exponential backoff and jitter on 429/5xx and connection errors,
+          honoring Retry-After. A 429 also pauses the whole host for that delay.
+    Results are reported through status_handling in the same order as the data source.
+    Invalid handles are rejected without a request, and repeated channels share the fetch of
+    the first one (see preflight.py).
+'''
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket():
+    """
+    Token bucket rate limiter for asyncio tasks.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """
+        Holds every request for the given time, e.g. after a 429.
+        """
+        self._paused_until = max(self._paused_until,
+                                 time.monotonic() + seconds)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens +
+                                   (now - self._refilled) * self.rate)
+                self._refilled = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncChannelCrawler():
+    def __init__(self, base_url: str = YOUTUBE_URL, concurrency: int = 20,
+                 rate: float = 10.0, burst: int = 20, max_retries: int = 4,
+                 backoff: float = 1.0, max_backoff: float = 60.0,
+                 timeout: float = 15.0, interrupt_check_interval: float = 5.0):
+        """
+        Args:
+            base_url: YouTube (or a local stand-in) base URL.
+            concurrency: Maximum requests in flight.
+            rate: Requests per second allowed per host.
+            burst: Requests that can be sent at once after an idle period.
+            max_retries: Retries of a channel on 429/5xx or connection errors.
+            backoff: Base delay of the exponential backoff, in seconds.
+            max_backoff: Maximum delay between retries, in seconds.
+            timeout: Total timeout of a request, in seconds.
+            interrupt_check_interval: Seconds between interruption checks in the Orchestrator.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.interrupt_check_interval = interrupt_check_interval
+        self.requests = 0
+        self.retries = 0
+
+    def channel_url(self, channel: str) -> str:
+        return f"{self.base_url}/@{channel}"
+
+    async def fetch(self, session: aiohttp.ClientSession, channel: str) -> dict:
+        """
+        Fetches and parses a channel page, retrying throttled and failed requests.
+        Returns: dict with channel_name, subscribers and videos.
+        """
+        url = self.channel_url(channel)
+        bucket = self._bucket(url)
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            retry_after = None
+            async with self._semaphore:
+                self.requests += 1
+                try:
+                    async with session.get(url) as response:
+                        status = response.status
+                        if status == 200:
+                            html = await response.text()
+                        retry_after = response.headers.get("Retry-After")
+                    error = f"HTTP {status}"
+                except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+                    status = None
+                    error = str(ex) or type(ex).__name__
+
+            if status == 200:
+                try:
+                    return parse_channel_page(html)
+                except ExtractionError as ex:
+                    raise SystemException(
+                        f"Could not parse the page of channel '{channel}': {ex}") from ex
+            if status == 404:
+                raise NotFoundException(
+                    f"The YouTube channel '{channel}' was not found.")
+            if status is not None and status not in RETRY_STATUSES:
+                break
+            if attempt == self.max_retries:
+                break
+
+            delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+            delay *= random.uniform(0.5, 1.0)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            if status == 429:
+                bucket.pause(delay)
+            self.retries += 1
+            logger.debug(
+                f"Retrying channel '{channel}' in {delay:.1f}s ({error}).")
+            await asyncio.sleep(delay)
+
+        raise SystemException(
+            f"Error fetching the YouTube channel '{channel}': {error}.")
+
+    async def fetch_cached(self, session: aiohttp.ClientSession, channel: str) -> dict:
+        """
+        Serves the channel from the result cache, fetching and caching it on a miss.
+        Returns: dict with channel_name, subscribers and videos.
+        """
+        if not result_cache:
+            return await self.fetch(session, channel)
+        cached = result_cache.get(channel)
+        if cached == NOT_FOUND:
+            raise NotFoundException(
+                f"The YouTube channel '{channel}' was not found (cached).")
+        if cached:
+            return cached
+        try:
+            data = await self.fetch(session, channel)
+        except NotFoundException:
+            result_cache.put_not_found(channel)
+            raise
+        result_cache.put(channel, data)
+        return data
+
+    def fetch_once(self, session: aiohttp.ClientSession, channel, tasks: OrderedDict) -> asyncio.Task:
+        """
+        Returns: Task fetching the channel, shared with the earlier items of the same channel.
+        A channel whose fetch failed with a system error is fetched again.
+        """
+        try:
+            handle = preflight.check(channel)
+        except InvalidInputException as ex:
+            return asyncio.create_task(self._rejected(ex))
+        task = tasks.get(handle)
+        if task is not None and (not task.done() or task.exception() is None
+                                 or isinstance(task.exception(), BusinessException)):
+            tasks.move_to_end(handle)
+            preflight.duplicates += 1
+            preflight.fanned_out += 1
+            return task
+        task = tasks[handle] = asyncio.create_task(self.fetch_cached(session, handle))
+        if len(tasks) > preflight.memo_size:
+            tasks.popitem(last=False)
+        return task
+
+    async def _rejected(self, exception: Exception):
+        raise exception
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    async def results(self, source):
+        """
+        Crawls the items of a data source with up to `concurrency` requests in flight.
+        Items are pulled from the source as slots free up, so memory stays bounded.
+        Yields: (item, source token, data, exception) tuples, in source order. The token is the
+        source's suspend() state for that item (e.g. the CSV row offset), restored with resume()
+        to report it.
+        """
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._buckets = {}
+        window = self.concurrency * 2
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency, limit_per_host=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        pending = deque()
+        tasks = OrderedDict()
+        items = iter(source)
+        exhausted = False
+        async with aiohttp.ClientSession(connector=connector, headers=HEADERS,
+                                         timeout=timeout) as session:
+            try:
+                while True:
+                    while not exhausted and len(pending) < window:
+                        # Pulling from the source is synchronous and quick for CSV inputs
+                        item = next(items, None)
+                        if item is None:
+                            exhausted = True
+                            break
+                        task = self.fetch_once(session, item.get("channel"), tasks)
+                        pending.append((item, source.suspend(), task))
+                    if not pending:
+                        return
+                    item, token, task = pending[0]
+                    try:
+                        data, error = await task, None
+                    except Exception as ex:
+                        data, error = None, ex
+                    pending.popleft()
+                    yield item, token, data, error
+            finally:
+                for _, _, task in pending:
+                    task.cancel()
+                self.unfinished = [(item, token) for item, token, _ in pending]
+
+    async def _report_all(self, source):
+        """
+        Reports the crawl results through status_handling, checking for interruptions periodically.
+        """
+        started = time.monotonic()
+        last_check = started
+        count = 0
+        self.unfinished = []
+        results = self.results(source)
+        try:
+            async for item, token, data, error in results:
+                STATE.item = item
+                source.resume(token)
+                now = time.monotonic()
+                if now - last_check >= self.interrupt_check_interval:
+                    last_check = now
+                    STATE.raise_for_interrupt_requested()
+                count += 1
+                if isinstance(error, BusinessException):
+                    handle_business_exception(error)
+                elif error is not None:
+                    handle_system_exception(error)
+                else:
+                    result = format_result(data)
+                    register_success(
+                        f"Item processed successfuly: {result}", result)
+        except InterruptException as ex:
+            await results.aclose()
+            # Give back the items that were fetched but not reported
+            for unfinished_item, unfinished_token in self.unfinished:
+                STATE.item = unfinished_item
+                source.resume(unfinished_token)
+                source.report_error("INTERRUPTION REQUESTED", ex)
+            # The item where the interruption was detected
+            STATE.item = item
+            source.resume(token)
+            handle_interrupt_requested(ex)
+        finally:
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"Crawled {count} channels in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.1f} items/s), "
+                f"{self.requests} requests, {self.retries} retries.")
+
+    def run(self, source):
+        """
+        Crawls and reports every item of the data source.
+        """
+        asyncio.run(self._report_all(source))
+
+
+def run_crawler():
+    """
+    Initializes the automation once, without browsers, and crawls the data source over HTTP.
+    """
+    STATE.raise_for_interrupt_requested()
+    run_once()
+    crawler.run(data_source)
+
+
+"""
+Setting the crawler: concurrency, rate limit and retries
+"""
+
+crawler = AsyncChannelCrawler(concurrency=20, rate=10.0, burst=20)
@@ -1,8 +1,19 @@
+import csv
 import datetime
+import gzip
+import json
 import logging
+import os
+import queue
+import threading
+import time
+from .reporting import reporter
+from .results import ChannelResult, ColumnarResultWriter, columnar_result_file
+from .shards import shard_of, task_shard
 from .state import STATE
+from .tracing import tracer
+from pathlib import Path
 from botcity.maestro import *
-from botcity.plugins.csv import BotCSVPlugin
 
 logger = logging.getLogger(__name__)
 
@@ -10,23 +21,65 @@ logger = logging.getLogger(__name__)
 datasources.py
     Sets up data sources. Provides ready-to-use DatapoolSource and CSVSource classes.
     To create your own data source class, inherit from BaseSource.
+    data_source is built by build_data_source() on first use, not on import, so importing the
+    framework doesn't read the input.
 '''
 
 
 class BaseSource():
-    """Base source for batch processing of items."""
+    """
+    Base source for batch processing of items.
+    Sources can be shared by parallel workers: subclasses fetch items under self._lock and keep
+    the item being processed per thread in current_item.
+    """
 
-    def report_success(self, status_message):
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    @property
+    def current_item(self):
+        """
+        Item being processed by the current thread.
+        """
+        return getattr(self._local, "item", None)
+
+    @current_item.setter
+    def current_item(self, value):
+        self._local.item = value
+
+    def suspend(self) -> dict:
+        """
+        Returns: State of the current thread's item, to report it later from any thread (see retry.py).
+        """
+        return dict(vars(self._local))
+
+    def resume(self, token: dict):
+        """
+        Makes the item of a suspend() token the current thread's item again.
+        """
+        vars(self._local).update(token)
+
+    def report_success(self, status_message, result=None):
+        """
+        result: Structured result of the item (e.g. ChannelResult), for sources that store it.
+        """
         raise NotImplementedError
 
     def report_error(self, error_type, status_message):
         raise NotImplementedError
 
+    def close(self):
+        """
+        Releases the resources held by the source. Called once when the automation finalizes.
+        """
+        ...
+
 
 class DatapoolSource(BaseSource):
     def __init__(self, label: str):
+        super().__init__()
         self.dp = STATE.maestro.get_datapool(label)
-        self.current_item = None
 
     def __str__(self):
         return f"Datapool {self.dp.label}"
@@ -35,22 +88,24 @@ class DatapoolSource(BaseSource):
         return self
 
     def __next__(self):
-        if not self.dp.is_active():
-            logger.warning(
-                f"Datapool {self.dp.label} isn't active. You can activate it in the BotCity Orchestrator.")
-            raise StopIteration
-        if not self.dp.has_next():
-            logger.info(f"Datapool {self.dp.label} has no more items.")
-            raise StopIteration
-        item = self.dp.next(STATE.task_id)
+        with self._lock, tracer.span("next_item"):
+            if not self.dp.is_active():
+                logger.warning(
+                    f"Datapool {self.dp.label} isn't active. You can activate it in the BotCity Orchestrator.")
+                raise StopIteration
+            if not self.dp.has_next():
+                logger.info(f"Datapool {self.dp.label} has no more items.")
+                raise StopIteration
+            item = self.dp.next(STATE.task_id)
         self.current_item = item
         STATE.item = item.values
         return item.values if item else None
 
-    def report_success(self, status_message):
+    def report_success(self, status_message, result=None):
         if not self.current_item:
             return
-        self.current_item.report_done(status_message)
+        reporter.submit("report_done", self.current_item.report_done,
+                        status_message, critical=True)
 
     def report_error(self, error_type, status_message):
         if not self.current_item:
@@ -62,25 +117,179 @@ class DatapoolSource(BaseSource):
         }
         error_type_enum = error_type_map.get(error_type, ErrorType.SYSTEM)
         message = str(status_message)
-        self.current_item.report_error(error_type_enum, message)
+        reporter.submit("report_error", self.current_item.report_error,
+                        error_type_enum, message, critical=True)
+
+
+class PrefetchingDatapoolSource(DatapoolSource):
+    """
+    Datapool source that leases items ahead of time on a background thread, so the item loop
+    doesn't wait for the Orchestrator round trips.
+    - lookahead: Maximum items leased but not yet handed out.
+    - activity_check_interval: Seconds between checks that the datapool is still active.
+    Items still in the buffer when the source is closed are reported back as SYSTEM errors, so the
+    datapool's retry policy makes them available again. Entries can't return to PENDING once pulled.
+    """
+
+    _END = object()
+
+    def __init__(self, label: str, lookahead: int = 10,
+                 activity_check_interval: float = 30.0):
+        super().__init__(label)
+        self.activity_check_interval = activity_check_interval
+        self._buffer = queue.Queue(maxsize=lookahead)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __next__(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._fill, name="datapool-prefetch", daemon=True)
+                self._thread.start()
+        with tracer.span("next_item"):
+            item = self._buffer.get()
+        if item is self._END:
+            # Leave the marker for the other workers
+            self._buffer.put(self._END)
+            raise StopIteration
+        self.current_item = item
+        STATE.item = item.values
+        return item.values
+
+    def _fill(self):
+        """
+        Leases items into the buffer until the datapool is empty or inactive, or the source is closed.
+        """
+        last_check = None
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if last_check is None or now - last_check >= self.activity_check_interval:
+                    last_check = now
+                    if not self.dp.is_active():
+                        logger.warning(
+                            f"Datapool {self.dp.label} isn't active. You can activate it in the BotCity Orchestrator.")
+                        break
+                item = self.dp.next(STATE.task_id)
+                if item is None:
+                    logger.info(f"Datapool {self.dp.label} has no more items.")
+                    break
+                if not self._put(item):
+                    self._release(item)
+        except Exception as ex:
+            logger.error(f"Error prefetching from datapool {self.dp.label}: {ex}")
+        finally:
+            self._put(self._END)
+
+    def _put(self, item) -> bool:
+        """
+        Waits for room in the buffer, giving up when the source is closed.
+        Returns: True if the item was buffered.
+        """
+        while not self._stop.is_set():
+            try:
+                self._buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _release(self, item):
+        reporter.submit("report_error", item.report_error, ErrorType.SYSTEM,
+                        "Not processed: leased item released on shutdown.", critical=True)
+
+    def close(self):
+        """
+        Stops prefetching and releases the leased items that were never handed out.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        released = 0
+        while True:
+            try:
+                item = self._buffer.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._END:
+                self._release(item)
+                released += 1
+        if released:
+            logger.info(f"Released {released} unprocessed items of datapool {self.dp.label}.")
 
 
 class CSVSource(BaseSource):
-    def __init__(self, file: str):
+    def __init__(self, file: str, streaming: bool = False,
+                 chunk_size: int = 10000, resume: bool = False,
+                 checkpoint_dir: str = "./checkpoints", shard: tuple = None,
+                 shard_key: str = "channel", columnar: str = None, flush_every: int = 1,
+                 flush_interval: float = 5.0, fsync_every: int = 0):
+        """
+        Args:
+            file: Path to the input CSV. Files ending in ".gz" are decompressed on the fly.
+            streaming: Reads the input lazily in chunks of chunk_size rows instead of loading it whole.
+            chunk_size: Number of rows held in memory at a time in streaming mode.
+            resume: Keeps a progress file in checkpoint_dir so a restarted task skips the rows
+                that already succeeded and copies their result rows to its own result files. The
+                progress file is removed once the input is exhausted without system errors.
+            checkpoint_dir: Folder of the progress files. Must not be wiped between tasks.
+            shard: (index from 0, count) to process only the rows whose shard_key hashes to
+                that shard (see shards.py). None processes every row.
+            shard_key: Column the rows are sharded by.
+            columnar: "parquet" or "arrow" also writes the results, with typed subscriber and
+                video counts, to a columnar file next to the result CSV (see results.py).
+            flush_every, flush_interval, fsync_every: Durability policy of the result CSV
+                (see CSVResultWriter).
+        """
+        # Imported here: pandas is only needed by CSV sources
+        import pandas as pd
+        from botcity.plugins.csv import BotCSVPlugin
+
+        super().__init__()
         self._file = file
+        self.streaming = streaming
+        self.chunk_size = chunk_size
         self.csv = BotCSVPlugin()
-        self.csv_out = BotCSVPlugin()
-        self.csv.read(file)
+        if streaming:
+            header = list(pd.read_csv(
+                file, sep=self.csv.separator, nrows=0, compression="infer").columns)
+            self.count = count_csv_rows(file)
+            self._rows = self._stream_rows()
+        else:
+            self.csv.read(file)
+            header = self.csv.header
+            self.count = len(self.csv.as_dataframe().index)
+            self._rows = self._frame_rows()
+        self.shard = shard
+        self.shard_key = shard_key
+        self.checkpoint = CSVCheckpoint(file, checkpoint_dir, shard) if resume else None
         self.csv_out_file = self.csv_result_file()
-        self.csv_out.set_header(
-            self.csv.header + ["TIMESTAMP", "STATUS", "MESSAGE"])
+        self.csv_out = CSVResultWriter(
+            self.csv_out_file, header + ["TIMESTAMP", "STATUS", "MESSAGE", "ATTEMPTS"],
+            flush_every=flush_every, flush_interval=flush_interval, fsync_every=fsync_every)
+        self.columnar_out = ColumnarResultWriter(
+            columnar_result_file(), header, columnar) if columnar else None
+        if self.checkpoint and self.checkpoint.success_count:
+            restored = self.checkpoint.restore(self.csv_out, self.columnar_out)
+            logger.info(
+                f"Resuming CSV {file}: skipping {self.checkpoint.success_count} rows that already succeeded, "
+                f"{restored} of their result rows copied to {self.csv_out_file}.")
         self.index = 0
-        self.count = len(self.csv.as_dataframe().index)
-        self.current_item = None
+        self._exhausted = False
 
     def __str__(self):
+        if self.shard:
+            return f"CSV {self._file} (shard {self.shard[0] + 1} of {self.shard[1]})"
         return f"CSV {self._file}"
 
+    @property
+    def current_offset(self):
+        """
+        Input row offset of the item being processed by the current thread.
+        """
+        return getattr(self._local, "offset", None)
+
     def __iter__(self):
         return self
 
@@ -89,16 +298,45 @@ class CSVSource(BaseSource):
         Fetch the next pending entry.
         Returns: item
         """
-        if self.index >= self.count:
-            logger.info(f"CSV {self._file} has no more items.")
+        with self._lock, tracer.span("next_item"):
+            for offset, item in self._rows:
+                if self.shard and shard_of(item.get(self.shard_key), self.shard[1]) != self.shard[0]:
+                    continue
+                if self.checkpoint and self.checkpoint.succeeded(offset):
+                    continue
+                self.index += 1
+                self._local.offset = offset
+                STATE.item = item
+                self.current_item = item
+                return item
+            if not self._exhausted:
+                logger.info(f"CSV {self._file} has no more items.")
+            self._exhausted = True
             raise StopIteration
-        item = self.csv.as_dataframe().loc[self.index].to_dict()
-        self.index += 1
-        STATE.item = item
-        self.current_item = item
-        return item
 
-    def _report(self, status, status_message):
+    def _frame_rows(self):
+        """
+        Yields (row offset, row) pairs from the loaded input.
+        """
+        df = self.csv.as_dataframe()
+        for offset in range(self.count):
+            yield offset, df.loc[offset].to_dict()
+
+    def _stream_rows(self):
+        """
+        Yields (row offset, row) pairs, reading at most chunk_size rows at a time.
+        """
+        import pandas as pd
+
+        offset = 0
+        with pd.read_csv(self._file, sep=self.csv.separator, compression="infer",
+                         chunksize=self.chunk_size) as reader:
+            for chunk in reader:
+                for item in chunk.to_dict("records"):
+                    yield offset, item
+                    offset += 1
+
+    def _report(self, status, status_message, result=None):
         if not self.current_item:
             return
 
@@ -107,15 +345,27 @@ class CSVSource(BaseSource):
             "STATUS": status,
             "MESSAGE": status_message
         })
-        self.csv_out.add_row(self.current_item)
-        self.csv_out.write(self.csv_out_file)
+        with self._lock:
+            self.csv_out.write_row(self.current_item)
+            if self.columnar_out:
+                self.columnar_out.write_row(self.current_item, result)
+            if self.checkpoint:
+                outcome = {"SUCCESS": "S", "BUSINESS EXCEPTION": "B"}.get(status, "E")
+                self.checkpoint.record(self.current_offset, outcome, self.current_item, result)
 
-    def report_success(self, status_message):
-        return self._report("SUCCESS", status_message)
+    def report_success(self, status_message, result=None):
+        return self._report("SUCCESS", status_message, result)
 
     def report_error(self, error_type, status_message):
         return self._report(error_type, status_message)
 
+    def close(self):
+        self.csv_out.close()
+        if self.columnar_out:
+            self.columnar_out.close()
+        if self.checkpoint:
+            self.checkpoint.close(clear=self._exhausted)
+
     def csv_result_file(self):
         date = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M")
         task_id = STATE.task_id
@@ -123,10 +373,302 @@ class CSVSource(BaseSource):
         return csv_result_file
 
 
+class CSVResultWriter():
+    """
+    Append-only writer for the result CSV. Each row is written once, so the cost per row stays
+    flat as the output grows.
+
+    Durability policy:
+        flush_every: Rows buffered before they are handed to the OS. With the default of 1, every
+            reported row survives a crash of the bot process. Higher values batch the writes and
+            only guarantee the rows up to the last flush.
+        flush_interval: Maximum seconds a buffered row waits before being flushed.
+        fsync_every: Rows between fsync calls, so rows also survive an OS crash or power loss.
+            0 disables fsync.
+    """
+
+    def __init__(self, file: str, header: list, flush_every: int = 1,
+                 flush_interval: float = 5.0, fsync_every: int = 0):
+        self.file = file
+        self.header = list(header)
+        self.flush_every = max(flush_every, 1)
+        self.flush_interval = flush_interval
+        self.fsync_every = fsync_every
+        self._f = None
+        self._writer = None
+        self._pending = 0
+        self._unsynced = 0
+        self._last_flush = time.monotonic()
+
+    def _open(self):
+        new_file = not os.path.exists(self.file) or os.path.getsize(self.file) == 0
+        self._f = open(self.file, "a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(
+            self._f, fieldnames=self.header, extrasaction="ignore")
+        if new_file:
+            self._writer.writeheader()
+
+    def write_row(self, row: dict):
+        """
+        Appends a row and flushes it according to the durability policy.
+        """
+        if self._f is None:
+            self._open()
+        # Missing values are written as empty cells, as pandas does
+        self._writer.writerow(
+            {k: "" if v is None or v != v else v for k, v in row.items()})
+        self._pending += 1
+        self._unsynced += 1
+        if (self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Hands the buffered rows to the OS and fsyncs them when the policy asks for it.
+        """
+        if self._f is None:
+            return
+        self._f.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        if self.fsync_every and self._unsynced >= self.fsync_every:
+            os.fsync(self._f.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        if self._f is None:
+            return
+        self._f.flush()
+        if self.fsync_every and self._unsynced:
+            os.fsync(self._f.fileno())
+        self._f.close()
+        self._f = None
+
+
+class CSVCheckpoint():
+    """
+    Progress file of a CSV input, used to resume a task that died partway.
+    The first line fingerprints the input (path, size and modification time), so the progress of
+    a different or edited file is never applied. Each following line is "<row offset>,<S|B|E>"
+    (success, business error, other error), appended as soon as the row is reported; the last
+    status of an offset wins. Only other errors (system errors, interruptions) can be fixed by
+    trying again: the progress file is kept while some are left.
+    Successes are followed by ",<result row as JSON>": ./output is wiped when a task starts, so
+    restore() copies the result rows of the earlier tasks from here into the new result files.
+    Succeeded offsets are kept in memory as a bitmap (one bit per input row), failed ones in a set.
+    """
+
+    def __init__(self, file: str, checkpoint_dir: str = "./checkpoints", shard: tuple = None):
+        Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+        # Shards of the same input can run on the same machine: one progress file each
+        name = f"{Path(file).name}.shard-{shard[0] + 1}-of-{shard[1]}" if shard else Path(file).name
+        self.file = str(Path(checkpoint_dir) / f"{name}.progress")
+        stat = os.stat(file)
+        self.fingerprint = f"#{Path(file).resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+        self._bitmap = bytearray()
+        self._failed = set()
+        self.success_count = 0
+        self._load()
+        self._f = open(self.file, "a", encoding="utf-8")
+        if self._f.tell() == 0:
+            self._f.write(self.fingerprint + "\n")
+            self._f.flush()
+
+    def _load(self):
+        if not os.path.exists(self.file):
+            return
+        with open(self.file, encoding="utf-8") as f:
+            if f.readline().rstrip("\n") != self.fingerprint:
+                logger.warning(
+                    f"Checkpoint {self.file} belongs to another version of the input. Starting over.")
+                f.close()
+                os.remove(self.file)
+                return
+            for line in f:
+                offset, status, _ = self._parse(line)
+                if offset is not None:
+                    self._set(offset, status)
+
+    @staticmethod
+    def _parse(line: str) -> tuple:
+        """
+        Returns: (row offset, status, result row as JSON or ""), offset None for invalid lines.
+        """
+        offset, _, rest = line.rstrip("\n").partition(",")
+        status, _, data = rest.partition(",")
+        if not offset.isdigit() or status not in ("S", "B", "E"):
+            return None, None, None
+        return int(offset), status, data
+
+    def _set(self, offset: int, status: str):
+        success = status == "S"
+        if status == "E":
+            self._failed.add(offset)
+        else:
+            self._failed.discard(offset)
+        byte, bit = divmod(offset, 8)
+        if byte >= len(self._bitmap):
+            self._bitmap.extend(bytes(byte - len(self._bitmap) + 1))
+        was_success = bool(self._bitmap[byte] & (1 << bit))
+        if success and not was_success:
+            self._bitmap[byte] |= 1 << bit
+            self.success_count += 1
+        elif not success and was_success:
+            self._bitmap[byte] &= ~(1 << bit) & 0xFF
+            self.success_count -= 1
+
+    def succeeded(self, offset: int) -> bool:
+        """
+        Returns: True if the row at this offset was already processed with success.
+        """
+        byte, bit = divmod(offset, 8)
+        return byte < len(self._bitmap) and bool(self._bitmap[byte] & (1 << bit))
+
+    def record(self, offset: int, status: str, row: dict = None, result: ChannelResult = None):
+        """
+        Appends the status of a row ("S", "B" or "E") to the progress file, with its result row
+        on success.
+        """
+        self._set(offset, status)
+        line = f"{offset},{status}"
+        if status == "S" and row is not None:
+            line += "," + json.dumps({"row": row, "result": result.as_dict() if result else None},
+                                     ensure_ascii=False, default=str)
+        self._f.write(line + "\n")
+        self._f.flush()
+
+    def restore(self, csv_out: "CSVResultWriter", columnar_out: ColumnarResultWriter = None) -> int:
+        """
+        Writes the result rows of the rows that already succeeded, once per row.
+        Returns: Number of result rows written.
+        """
+        restored = bytearray(len(self._bitmap))
+        count = 0
+        with open(self.file, encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                offset, status, data = self._parse(line)
+                if status != "S" or not data or not self.succeeded(offset):
+                    continue
+                byte, bit = divmod(offset, 8)
+                if restored[byte] & (1 << bit):
+                    continue
+                restored[byte] |= 1 << bit
+                entry = json.loads(data)
+                csv_out.write_row(entry["row"])
+                if columnar_out:
+                    result = ChannelResult(**entry["result"]) if entry["result"] else None
+                    columnar_out.write_row(entry["row"], result)
+                count += 1
+        return count
+
+    def close(self, clear: bool = False):
+        """
+        Closes the progress file. With clear=True the file is removed, so the next task starts over,
+        unless some rows failed with a system error: it is kept so the next task retries them.
+        Business errors (e.g. a channel that doesn't exist) don't keep it.
+        """
+        self._f.close()
+        if clear and self._failed:
+            logger.warning(
+                f"{len(self._failed)} rows failed with a system error. Checkpoint {self.file} kept, "
+                f"so the next task retries them.")
+        elif clear:
+            os.remove(self.file)
+            logger.info(f"Input fully processed. Checkpoint {self.file} removed.")
+
+
+def count_csv_rows(file: str, block_size: int = 1 << 20) -> int:
+    """
+    Counts the data rows of a CSV by counting line breaks, without parsing it.
+    Quoted values spanning several lines are counted once per line.
+    Returns: Number of rows, excluding the header.
+    """
+    opener = gzip.open if str(file).endswith(".gz") else open
+    lines = 0
+    last = b"\n"
+    with opener(file, "rb") as f:
+        while block := f.read(block_size):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+
+class LazySource():
+    """
+    Stands in for the data source until it is first used, then builds it with factory() once
+    and forwards everything to it. close() does nothing if the source was never built.
+    """
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_source", None)
+        object.__setattr__(self, "_build_lock", threading.Lock())
+
+    @property
+    def source(self) -> BaseSource:
+        if self._source is None:
+            with self._build_lock:
+                if self._source is None:
+                    source = self._factory()
+                    logger.info(f"Datasource set to {source}.")
+                    object.__setattr__(self, "_source", source)
+        return self._source
+
+    def __iter__(self):
+        return iter(self.source)
+
+    def __next__(self):
+        return next(self.source)
+
+    def __getattr__(self, name):
+        return getattr(self.source, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.source, name, value)
+
+    def __str__(self):
+        return str(self._source) if self._source is not None else "Datasource (not built yet)"
+
+    def configure(self, factory):
+        """
+        Replaces the factory, e.g. to run the automation against another input. Only possible
+        before the source is built.
+        """
+        if self._source is not None:
+            raise RuntimeError(f"{self._source} is already in use.")
+        object.__setattr__(self, "_factory", factory)
+
+    def close(self):
+        if self._source is not None:
+            self._source.close()
+
+
 """
 Setting Datasource: Datapool | CSV
 """
 
-# data_source = DatapoolSource("BeaPro-YoutubeChannels")
-data_source = CSVSource(r"./resources/input-channels-4.csv")
-logger.info(f"Datasource set to {data_source}.")
+
+def build_data_source() -> BaseSource:
+    """
+    Builds the data source of the automation. Called on first use of data_source.
+    Returns: BaseSource
+    """
+    # return DatapoolSource("BeaPro-YoutubeChannels")
+    # return PrefetchingDatapoolSource("BeaPro-YoutubeChannels", lookahead=10)
+    # shard=task_shard() processes only the shard given in the task parameters (see shards.py)
+    return CSVSource(r"./resources/input-channels-4.csv", shard=task_shard())
+    # For very large inputs (plain or .gz), read the file lazily instead:
+    # return CSVSource(r"./resources/input-channels.csv.gz", streaming=True)
+    # To skip the rows that already succeeded when a task is restarted after a crash:
+    # return CSVSource(r"./resources/input-channels-4.csv", resume=True)
+    # To batch the result CSV writes (rows up to the last flush survive a crash) and fsync them:
+    # return CSVSource(r"./resources/input-channels-4.csv", flush_every=100, fsync_every=1000)
+    # To also write the results with typed counts to Parquet (needs pyarrow):
+    # return CSVSource(r"./resources/input-channels-4.csv", columnar="parquet")
+
+
+data_source = LazySource(build_data_source)
@@ -0,0 +1,139 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import threading
+from .exceptions import SystemException
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+'''
+drivers.py
+    Resolves the WebDriver (geckodriver) from a local cache, without network access.
+    The driver is pinned in DRIVER_CACHE_DIR with a lock file holding its version and SHA-256.
+    Every resolution checks the checksum and reuses the binary. The result is memoized, so
+    browser restarts don't repeat the check.
+    Only an explicit refresh looks up and downloads a driver:
+        python -m framework.drivers refresh [--version v0.36.0]
+    For air-gapped runners, refresh on a machine with network access, ship the DRIVER_CACHE_DIR
+    folder with the bot and set AUTO_BOOTSTRAP = False.
+'''
+
+DRIVER_CACHE_DIR = "./drivers"
+LOCK_FILE = "geckodriver.lock.json"
+# Version installed by refresh. None installs the latest release.
+GECKODRIVER_VERSION = "v0.36.0"
+# Downloads and pins the driver on startup when none is pinned yet. Set to False on
+# air-gapped runners, so a missing driver fails fast instead of trying the network.
+AUTO_BOOTSTRAP = True
+
+_resolved = None
+# Parallel workers resolve the driver at the same time: only one bootstraps and verifies it
+_resolve_lock = threading.Lock()
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_lock(cache_dir: str = DRIVER_CACHE_DIR) -> dict:
+    """
+    Returns: The pinned driver (version, path, sha256), or None if no driver is pinned.
+    """
+    lock_path = Path(cache_dir) / LOCK_FILE
+    if not lock_path.is_file():
+        return None
+    return json.loads(lock_path.read_text(encoding="utf-8"))
+
+
+def verify_geckodriver(cache_dir: str = DRIVER_CACHE_DIR) -> str:
+    """
+    Checks that the pinned driver exists and matches its checksum.
+    Returns: Path of the driver.
+    """
+    lock = read_lock(cache_dir)
+    if lock is None:
+        raise SystemException(
+            f"No geckodriver pinned in {cache_dir}. Run: python -m framework.drivers refresh")
+    path = Path(cache_dir) / lock["path"]
+    if not path.is_file():
+        raise SystemException(f"Pinned geckodriver not found: {path}.")
+    if file_sha256(path) != lock["sha256"]:
+        raise SystemException(
+            f"Checksum mismatch for {path}. Run: python -m framework.drivers refresh")
+    return str(path.resolve())
+
+
+def resolve_geckodriver(cache_dir: str = DRIVER_CACHE_DIR) -> str:
+    """
+    Returns the path of the pinned geckodriver, without network access.
+    Bootstraps the cache with a download only when nothing is pinned and AUTO_BOOTSTRAP is on.
+    Returns: Path of the driver.
+    """
+    global _resolved
+    if _resolved:
+        return _resolved
+    with _resolve_lock:
+        if _resolved:
+            return _resolved
+        if read_lock(cache_dir) is None and AUTO_BOOTSTRAP:
+            logger.warning(
+                f"No geckodriver pinned in {cache_dir}. Downloading {GECKODRIVER_VERSION or 'the latest version'} once.")
+            refresh_geckodriver(GECKODRIVER_VERSION, cache_dir)
+        _resolved = verify_geckodriver(cache_dir)
+        logger.info(f"Using geckodriver {_resolved}.")
+        return _resolved
+
+
+def refresh_geckodriver(version: str = GECKODRIVER_VERSION,
+                        cache_dir: str = DRIVER_CACHE_DIR) -> str:
+    """
+    Downloads geckodriver with WebDriver Manager and pins it in the cache.
+    Returns: Path of the driver.
+    """
+    global _resolved
+    # Imported here: only refresh needs WebDriver Manager and the network
+    from webdriver_manager.firefox import GeckoDriverManager
+
+    downloaded = Path(GeckoDriverManager(version=version).install())
+    version = version or downloaded.parent.name
+    target = Path(cache_dir) / version / downloaded.name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(downloaded, target)
+    target.chmod(target.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+    lock = {
+        "version": version,
+        "path": os.path.relpath(target, cache_dir),
+        "sha256": file_sha256(target),
+    }
+    (Path(cache_dir) / LOCK_FILE).write_text(json.dumps(lock, indent=2), encoding="utf-8")
+    _resolved = None
+    logger.info(f"Pinned geckodriver {version} at {target}.")
+    return str(target.resolve())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manages the pinned geckodriver.")
+    parser.add_argument("command", choices=["refresh", "verify"])
+    parser.add_argument("--version", default=GECKODRIVER_VERSION,
+                        help="Version to pin on refresh, e.g. v0.36.0.")
+    parser.add_argument("--cache-dir", default=DRIVER_CACHE_DIR)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "refresh":
+        print(refresh_geckodriver(args.version, args.cache_dir))
+    else:
+        print(verify_geckodriver(args.cache_dir))
+
+
+if __name__ == "__main__":
+    main()
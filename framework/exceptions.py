@@ -6,6 +6,8 @@ logger = logging.getLogger(__name__)
 Exceptions
     Custom exception hierarchy for categorizing bot errors:
     - BusinessException: For business logic and validation errors
+        - NotFoundException: The item's target doesn't exist (e.g. a 404 page)
+        - InvalidInputException: The item can never be processed (e.g. an invalid handle)
     - SystemException: For technical/infrastructure failures
     - InterruptException: For process interruptions and cancellations
 '''
@@ -15,6 +17,14 @@ class BusinessException(RuntimeError):
     ...
 
 
+class NotFoundException(BusinessException):
+    ...
+
+
+class InvalidInputException(BusinessException):
+    ...
+
+
 class SystemException(RuntimeError):
     ...
 
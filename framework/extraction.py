@@ -0,0 +1,165 @@
+import json
+import logging
+import re
+import requests
+import threading
+from .exceptions import NotFoundException, SystemException
+from .tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+'''
+extraction.py
+    Browserless extraction of YouTube channel metadata.
+    Fetches the channel page over plain HTTP and reads the handle, subscriber count and video count
+    from the initial-data JSON embedded in the page, without loading it in a browser.
+    Raises ExtractionError when the page can't be parsed, so the caller can fall back to the WebBot.
+'''
+
+YOUTUBE_URL = "https://www.youtube.com"
+
+# Accept-Language keeps the counts in English ("1.2M subscribers"), the consent cookie skips
+# the EU cookie wall that replaces the channel page.
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cookie": "CONSENT=YES+cb; SOCS=CAI",
+}
+
+INITIAL_DATA_PATTERN = re.compile(
+    r'(?:var\s+ytInitialData|window\["ytInitialData"\])\s*=\s*')
+
+
+class ExtractionError(Exception):
+    """The channel page was fetched but its metadata couldn't be parsed."""
+    ...
+
+
+class HttpChannelExtractor():
+    """
+    Reads channel metadata over HTTP, keeping one pooled keep-alive session per thread.
+    """
+
+    def __init__(self, base_url: str = YOUTUBE_URL, timeout: float = 15.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def channel_url(self, channel: str) -> str:
+        return f"{self.base_url}/@{channel}"
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            self._local.session = session
+        return session
+
+    def fetch(self, channel: str) -> str:
+        """
+        Downloads the channel page.
+        Returns: HTML of the page.
+        """
+        try:
+            response = self._session().get(
+                self.channel_url(channel), timeout=self.timeout)
+        except requests.RequestException as ex:
+            raise SystemException(
+                f"Error fetching the YouTube channel '{channel}': {ex}") from ex
+        if response.status_code == 404:
+            raise NotFoundException(
+                f"The YouTube channel '{channel}' was not found.")
+        if response.status_code != 200:
+            raise SystemException(
+                f"Error fetching the YouTube channel '{channel}': HTTP {response.status_code}.")
+        return response.text
+
+    def extract(self, channel: str) -> dict:
+        """
+        Fetches and parses the channel page.
+        Returns: dict with channel_name, subscribers and videos.
+        """
+        with tracer.span("http_fetch"):
+            html = self.fetch(channel)
+        with tracer.span("parse"):
+            return parse_channel_page(html)
+
+
+def parse_channel_page(html: str) -> dict:
+    """
+    Parses the initial-data JSON embedded in a channel page.
+    Returns: dict with channel_name, subscribers and videos, as shown in the page header.
+    """
+    match = INITIAL_DATA_PATTERN.search(html)
+    if not match:
+        raise ExtractionError("ytInitialData not found in the page.")
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError as ex:
+        raise ExtractionError(f"Invalid ytInitialData: {ex}") from ex
+
+    lines = header_metadata_lines(data)
+    if len(lines) < 3:
+        raise ExtractionError(
+            f"Channel metadata not found in ytInitialData: {lines}")
+    return {
+        "channel_name": lines[0].strip("@"),
+        "subscribers": lines[1],
+        "videos": lines[2],
+    }
+
+
+def header_metadata_lines(data: dict) -> list:
+    """
+    Returns the metadata texts of the channel header (handle, subscribers, videos), in the order
+    they are rendered in the yt-content-metadata-view-model element.
+    """
+    header = data.get("header", {})
+
+    # Current layout: pageHeaderRenderer > ... > contentMetadataViewModel
+    metadata = find_key(header, "contentMetadataViewModel")
+    if metadata:
+        return [part["text"]["content"]
+                for row in metadata.get("metadataRows", [])
+                for part in row.get("metadataParts", [])
+                if part.get("text", {}).get("content", "").strip() not in ("", "•")]
+
+    # Legacy layout
+    legacy = header.get("c4TabbedHeaderRenderer")
+    if legacy:
+        return [text for text in (
+            run_text(legacy.get("channelHandleText")),
+            run_text(legacy.get("subscriberCountText")),
+            run_text(legacy.get("videosCountText"))) if text]
+    return []
+
+
+def find_key(node, key: str):
+    """
+    Depth-first search for the first value stored under key in nested dicts and lists.
+    """
+    if isinstance(node, dict):
+        if key in node:
+            return node[key]
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        found = find_key(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def run_text(text: dict) -> str:
+    """
+    Flattens a YouTube text object ({"simpleText": ...} or {"runs": [...]}).
+    """
+    if not text:
+        return ""
+    if "simpleText" in text:
+        return text["simpleText"]
+    return "".join(run.get("text", "") for run in text.get("runs", []))
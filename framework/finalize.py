@@ -3,8 +3,15 @@ from botcity.maestro import *
 from .logger import *
 import logging
 from .datasources import *
-import glob
-from pathlib import Path
+from .cache import result_cache
+from .preflight import preflight
+from .process import page_readiness
+from .metrics import metrics
+from .reporting import reporter
+from .retry import retry_scheduler
+from .screenshots import screenshots
+from .tracing import tracer
+from .uploads import uploader
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +21,9 @@ finalize.py
     Gracefully ends the automation process using Cleanup and Finalize steps.
 '''
 
+# Seconds finalize() waits for the reporting queue to send the pending Orchestrator calls
+REPORTING_DRAIN_TIMEOUT = 60.0
+
 
 def cleanup():
     """
@@ -50,13 +60,28 @@ def finalize():
         ...
 
         try:
-            STATE.maestro.new_log_entry(
-                STATE.task_info().activity_name, {
-                    "message": finish_status_message()})
+            reporter.submit("new_log_entry", STATE.maestro.new_log_entry,
+                            STATE.task_info().activity_name, {
+                                "message": finish_status_message()})
         except Exception as ex:
             logger.error(
                 f"Error while trying to create a new log entry in the BotCity Orchestrator: {ex}")
 
+        # Write pending results before uploading them
+        retry_scheduler.close()
+        data_source.close()
+        if result_cache:
+            result_cache.close()
+        tracer.close()
+
+        # Send the queued alerts, errors and datapool reports
+        screenshots.drain()
+        reporter.drain(timeout=REPORTING_DRAIN_TIMEOUT)
+        logger.info(reporter.stats_message())
+        overhead = log_overhead_message(STATE.total_items)
+        if overhead:
+            logger.info(overhead)
+
         # Upload output folder to BotCity Orchestrator as Result Files
         upload_output_orchestrator()
 
@@ -66,22 +91,25 @@ def finalize():
     finally:
         finish_task_orchestrator()
         print(finish_status_message())
+        STATE.stop_task_poller()
+        metrics.stop()
+        stop_logging()
 
 
 def upload_output_orchestrator():
     """
-    Uploads the whole output folder to the BotCity Orchestrator.
+    Uploads the output folder to the BotCity Orchestrator (see uploads.py), skipping the files
+    already uploaded by a checkpoint with the same content.
     """
     try:
         logger.info(
             f"Uploading output to BotCity Orchestrator as Result Files...")
-        for f in glob.iglob("./output/*"):
-            fp = Path(f)
-            STATE.maestro.post_artifact(
-                task_id=STATE.task_id,
-                artifact_name=fp.name,
-                filepath=fp
-            )
+        uploader.stop()
+        # The log file is uploaded too: write the queued records first
+        flush_logs()
+        failed = uploader.upload_output()
+        if failed:
+            logger.error(f"{failed} Result Files could not be uploaded to BotCity Orchestrator.")
 
     except Exception as ex:
         print(f"Error uploading output to BotCity Orchestrator: {ex}")
@@ -118,6 +146,16 @@ def finish_status_message() -> str:
         In our run for task {STATE.task_id} we processed {STATE.total_items} items, from which {STATE.success_count} were with success.
         Check the Result Files for more details.
         '''
+        if result_cache:
+            msg = msg + result_cache.stats_message() + "\n"
+        if preflight.invalid or preflight.duplicates:
+            msg = msg + preflight.stats_message() + "\n"
+        if retry_scheduler.retried or retry_scheduler.breaker and retry_scheduler.breaker.trips:
+            msg = msg + retry_scheduler.stats_message() + "\n"
+        if page_readiness.timings:
+            msg = msg + page_readiness.summary_message() + "\n"
+        if tracer.durations:
+            msg = msg + tracer.summary_message() + "\n"
         # Append optional extra message from STATE.finish_message_extra if
         # present
         extra = getattr(STATE, "finish_message_extra", None)
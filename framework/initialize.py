@@ -3,13 +3,12 @@ import shutil
 from .exceptions import *
 from .finalize import cleanup
 from .logger import setup_botcity_log, setup_logger
+from .drivers import resolve_geckodriver
+from .metrics import metrics
 from .state import STATE
-from botcity.core import DesktopBot
+from .uploads import uploader
 from botcity.maestro import *
-from botcity.web import Browser, By, WebBot
 from pathlib import Path
-# Imports WebDriver Manager for Firefox
-from webdriver_manager.firefox import GeckoDriverManager
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +19,40 @@ initialize.py
 
 '''
 
+# Browser profile:
+#   "default": Firefox with a visible window and BotCity's default options.
+#   "scrape": headless Firefox that doesn't load the heavy resources listed in
+#             SCRAPE_PROFILE_PREFERENCES, except the categories in SCRAPE_PROFILE_ALLOW.
+BROWSER_PROFILE = "default"
+
+# Firefox preferences set by the scrape profile, per resource category.
+# Scripts are never blocked: YouTube builds the channel header with JavaScript.
+SCRAPE_PROFILE_PREFERENCES = {
+    "images": {"permissions.default.image": 2},
+    "media": {
+        "media.autoplay.default": 5,
+        "media.autoplay.blocking_policy": 2,
+        "media.mediasource.enabled": False,
+        "media.play-stand-alone": False,
+    },
+    "fonts": {
+        "browser.display.use_document_fonts": 0,
+        "gfx.downloadable_fonts.enabled": False,
+    },
+    "stylesheets": {"permissions.default.stylesheet": 2},
+    "animations": {"image.animation_mode": "none", "ui.prefersReducedMotion": 1},
+    "prefetch": {
+        "network.prefetch-next": False,
+        "network.dns.disablePrefetch": True,
+        "network.http.speculative-parallel-limit": 0,
+    },
+    "notifications": {"dom.webnotifications.enabled": False, "dom.push.enabled": False},
+}
+
+# Categories the scrape profile keeps enabled. Stylesheets stay on because WebElement.text only
+# returns the text Firefox considers visible, which depends on the page styles.
+SCRAPE_PROFILE_ALLOW = {"stylesheets"}
+
 
 def run_once():
     """
@@ -28,6 +61,9 @@ def run_once():
     try:
         setup_temp_folders()
         setup_logger()
+        metrics.start()
+        STATE.start_task_poller()
+        uploader.start()
         setup_botcity_log()
         execution = STATE.execution
         logger.info(
@@ -70,23 +106,47 @@ def initialize(restart: bool = False):
 
 def init_webbot():
     """
-    Instantiates BotCity's WebBot, installs the DriverManager and opens the browser.
+    Instantiates BotCity's WebBot with the pinned geckodriver and opens the browser.
     """
+    # Imported here, so importing the framework doesn't load Selenium
+    from botcity.web import Browser, WebBot
+
     STATE.webbot = WebBot()
-    STATE.webbot.headless = False
+    STATE.webbot.headless = BROWSER_PROFILE == "scrape"
 
     # Sets default browser to Firefox
     STATE.webbot.browser = Browser.FIREFOX
+    if BROWSER_PROFILE == "scrape":
+        STATE.webbot.options = scrape_profile_options()
+
+    # Uses the geckodriver pinned in ./drivers, without network access (see drivers.py)
+    STATE.webbot.driver_path = resolve_geckodriver()
+
 
-    # Installs the latest version indicating the WebDriver to be used by the
-    # bot
-    STATE.webbot.driver_path = GeckoDriverManager().install()
+def scrape_profile_options():
+    """
+    Builds headless Firefox options that block the heavy resources a scrape doesn't need.
+    Returns: FirefoxOptions
+    """
+    from botcity.web.browsers.firefox import default_options
+
+    options = default_options(headless=True)
+    for category, preferences in SCRAPE_PROFILE_PREFERENCES.items():
+        if category in SCRAPE_PROFILE_ALLOW:
+            continue
+        for name, value in preferences.items():
+            options.set_preference(name, value)
+    blocked = sorted(set(SCRAPE_PROFILE_PREFERENCES) - SCRAPE_PROFILE_ALLOW)
+    logger.info(f"Scrape profile: headless, blocking {', '.join(blocked)}.")
+    return options
 
 
 def init_desktopbot():
     """
     Instantiates BotCity's DesktopBot.
     """
+    from botcity.core import DesktopBot
+
     STATE.desktopbot = DesktopBot()
 
 
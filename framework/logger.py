@@ -1,8 +1,14 @@
 import datetime
+import json
 import logging
+import queue
+import threading
+import time
 from .state import STATE
+from atexit import register
 from botcity.maestro import *
-from logging import basicConfig, getLogger
+from logging.handlers import (QueueHandler, QueueListener, RotatingFileHandler,
+                              TimedRotatingFileHandler)
 
 '''
 Logger
@@ -11,16 +17,122 @@ Logger
     - Sets up logging format with timestamps
     - Configures BotCity's built-in Execution Log 
     - Provides a reusable logger instance
+    - In "queue" mode, the logging threads only queue the records. A listener thread formats
+      and writes them, so the file I/O doesn't run on the scraping threads.
+    - Writes JSON Lines (one object per record, with the task ID and the item as fields) or the
+      classic text format, and rotates the file by size or time.
+    - Sets the level of each module from LOG_LEVELS.
 
     Usage:
         Import the logger in other files with:
         logger = logging.getLogger(__name__)
         logger.info(f"Add your message including {variables}.")
+        On the hot path (every item), pass the variables as arguments instead, so the message is
+        only formatted if the record is written, and by the listener thread:
+        logger.info("Item %s processed.", channel)
 '''
 
 
 logger = logging.getLogger(__name__)
 
+# "sync": records are written by the thread that logs them. "queue": by a listener thread.
+LOG_MODE = "sync"
+# "text": the classic format (.log). "json": one JSON object per line (.jsonl).
+LOG_FORMAT = "text"
+# {"max_bytes": ..., "backup_count": ...} rotates by size, {"when": "H", "interval": 6, "backup_count": ...}
+# by time (see TimedRotatingFileHandler). {} never rotates.
+LOG_ROTATION = {"max_bytes": 50 * 1024 ** 2, "backup_count": 5}
+# Level per logger name, "" is the root logger. E.g. "framework.readiness": "DEBUG" for a single module.
+LOG_LEVELS = {
+    "": "INFO",
+    "selenium": "WARNING",
+    "urllib3": "WARNING",
+}
+# Item field written to each record to identify the item
+LOG_ITEM_KEY = "channel"
+# Microseconds per item the logging threads may spend logging. Above it, finalize() logs a warning.
+LOG_BUDGET_US = 200.0
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+TEXT_FORMAT = '%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s [%(item)s]: %(message)s'
+# Argument types formatted by the listener. Others may change after the call and are formatted right away.
+IMMUTABLE_ARGS = (str, int, float, bool, type(None), bytes, BaseException)
+
+_listener = None
+_handler = None
+_front = None
+
+
+class ContextFilter(logging.Filter):
+    """
+    Adds the task ID and the item of the logging thread to the records, as `task_id` and `item`.
+    """
+
+    def __init__(self, item_key: str = LOG_ITEM_KEY):
+        super().__init__()
+        self.item_key = item_key
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.task_id = STATE.task_id
+        item = STATE.item
+        record.item = item.get(self.item_key) if item else None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": f"{self.formatTime(record, DATE_FORMAT)}.{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "thread": record.threadName,
+            "task_id": getattr(record, "task_id", None),
+            "item": getattr(record, "item", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Queues the records without formatting them, unlike QueueHandler: the listener thread does it.
+    Also counts the time the logging threads spend in it.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.records = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        started = time.perf_counter()
+        try:
+            return super().handle(record)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.records += 1
+                self.seconds += elapsed
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(value, IMMUTABLE_ARGS) for value in values):
+                record.msg = record.getMessage()
+                record.args = None
+        return record
+
 
 def log_result_file() -> str:
     """
@@ -28,25 +140,103 @@ def log_result_file() -> str:
     """
     date = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M")
     task_id = STATE.task_id
-    log_result_file = f".\\output\\Log_BotCity_task-{task_id}_date-{date}.log"
+    extension = "jsonl" if LOG_FORMAT == "json" else "log"
+    log_result_file = f".\\output\\Log_BotCity_task-{task_id}_date-{date}.{extension}"
     return log_result_file
 
 
+def file_handler(log_file: str) -> logging.Handler:
+    """
+    Returns: File handler of the log, rotating as set in LOG_ROTATION.
+    """
+    if LOG_ROTATION.get("when"):
+        handler = TimedRotatingFileHandler(log_file, when=LOG_ROTATION["when"],
+                                           interval=LOG_ROTATION.get("interval", 1),
+                                           backupCount=LOG_ROTATION.get("backup_count", 0),
+                                           encoding='utf-8')
+    elif LOG_ROTATION.get("max_bytes"):
+        handler = RotatingFileHandler(log_file, maxBytes=LOG_ROTATION["max_bytes"],
+                                      backupCount=LOG_ROTATION.get("backup_count", 0),
+                                      encoding='utf-8')
+    else:
+        handler = logging.FileHandler(log_file, encoding='utf-8')
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+    return handler
+
+
+def apply_levels(levels: dict):
+    for name, level in levels.items():
+        logging.getLogger(name or None).setLevel(level)
+
+
 def setup_logger():
     """
     Setups Python logger.
     """
+    global _listener, _handler, _front
+    if _handler:
+        return
     log_file = log_result_file()
-    basicConfig(filename=log_file,
-                level=logging.INFO,
-                datefmt='%Y-%m-%d %H:%M:%S',
-                format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s: %(message)s',
-                encoding='utf-8'
-                )
+    _handler = file_handler(log_file)
+    if LOG_MODE == "queue":
+        log_queue = queue.Queue()
+        _front = LazyQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, _handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        _front = _handler
+    _front.addFilter(ContextFilter())
+    logging.getLogger().addHandler(_front)
+    apply_levels(LOG_LEVELS)
     logger.info(ascii_text)
     logger.info(f"Log created at {log_file}.")
 
 
+def flush_logs():
+    """
+    Waits until the queued records are written, e.g. before the log file is uploaded.
+    """
+    if _listener:
+        _listener.queue.join()
+    if _handler:
+        _handler.flush()
+
+
+@register
+def stop_logging():
+    """
+    Writes the queued records and stops the listener. Later records are written by the logging
+    thread, so nothing is lost after finalize().
+    """
+    global _listener, _front
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    root = logging.getLogger()
+    root.removeHandler(_front)
+    _front = _handler
+    _front.addFilter(ContextFilter())
+    root.addHandler(_front)
+
+
+def log_overhead_message(items: int) -> str:
+    """
+    Time the logging threads spent queuing records, per item, against LOG_BUDGET_US.
+    """
+    if not isinstance(_front, LazyQueueHandler) or not items:
+        return ""
+    per_item = _front.seconds / items * 1e6
+    message = (f"Logging: {_front.records} records, {per_item:.1f} us per item on the logging threads "
+               f"(budget {LOG_BUDGET_US:g} us).")
+    if per_item > LOG_BUDGET_US:
+        logger.warning(f"Logging overhead over the budget. {message}")
+    return message
+
+
 def setup_botcity_log():
     try:
         STATE.maestro.new_log(STATE.task_info().activity_name, [
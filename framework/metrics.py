@@ -0,0 +1,273 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from .readiness import browser_rss
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+'''
+metrics.py
+    Live metrics of a running task in the OpenMetrics text format, to watch throughput drops and
+    error storms while a long task runs instead of after finalize().
+    - Items processed by outcome, errors by exception type, retried attempts by exception type,
+      items in flight, browser recoveries by level, throughput, per-phase latency histograms (fed by tracing.py), browser memory and
+      the reporting queue depth.
+    - bot.action() and the workers call item_started()/recovered(), status_handling calls
+      item_finished(), retry.py calls item_retried(). An item is counted once, with its final
+      outcome, however many attempts it takes.
+    - Exposed as a textfile rewritten every `interval` seconds (e.g. for the node_exporter textfile
+      collector), and/or over HTTP on 127.0.0.1:<port>/metrics.
+'''
+
+# Upper bounds of the phase latency histogram buckets, in seconds
+PHASE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class MetricsExporter():
+    def __init__(self, textfile: str = "./temp/metrics.prom", port: int = None,
+                 interval: float = 15.0, throughput_window: float = 60.0,
+                 browser_sample_interval: float = 30.0):
+        """
+        Args:
+            textfile: File rewritten with the metrics every interval seconds. None disables it.
+            port: Serves the metrics on http://127.0.0.1:<port>/metrics. None disables it.
+            interval: Seconds between rewrites of the textfile.
+            throughput_window: Seconds over which the current throughput is computed.
+            browser_sample_interval: Minimum seconds between browser memory readings per worker.
+        """
+        self.textfile = textfile
+        self.port = port
+        self.interval = interval
+        self.throughput_window = throughput_window
+        self.browser_sample_interval = browser_sample_interval
+        self.started_at = time.time()
+        self.started = 0
+        self.outcomes = {}
+        self.errors = {}
+        self.retries = {}
+        self.recoveries = {}
+        self.browser_rss = {}
+        self.phases = {}
+        self._finished = deque()
+        self._browser_sampled = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def item_started(self, item: dict = None):
+        """
+        Counts an item as in flight. Later attempts of an item (ATTEMPTS > 1) are already counted.
+        """
+        if item and item.get("ATTEMPTS", 1) > 1:
+            return
+        with self._lock:
+            self.started += 1
+
+    def item_finished(self, outcome: str, exception: Exception = None):
+        """
+        Counts an item by outcome, and its exception by type.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            if exception is not None:
+                name = type(exception).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+            self._finished.append(now)
+            while self._finished and now - self._finished[0] > self.throughput_window:
+                self._finished.popleft()
+
+    def item_retried(self, exception: Exception):
+        """
+        Counts a failed attempt that will be retried. The item stays in flight until its final
+        outcome is reported with item_finished().
+        """
+        name = type(exception).__name__
+        with self._lock:
+            self.retries[name] = self.retries.get(name, 0) + 1
+
+    def recovered(self, level: str):
+        with self._lock:
+            self.recoveries[level] = self.recoveries.get(level, 0) + 1
+
+    def observe_phase(self, phase: str, seconds: float):
+        with self._lock:
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                # Bucket counts (the last one is +Inf), sum
+                histogram = self.phases[phase] = [[0] * (len(PHASE_BUCKETS) + 1), 0.0]
+            histogram[0][bisect.bisect_left(PHASE_BUCKETS, seconds)] += 1
+            histogram[1] += seconds
+
+    def sample_browser(self, webbot):
+        """
+        Records the browser memory of the current worker, at most every browser_sample_interval.
+        """
+        worker = threading.current_thread().name
+        now = time.monotonic()
+        if now - self._browser_sampled.get(worker, -self.browser_sample_interval) < self.browser_sample_interval:
+            return
+        self._browser_sampled[worker] = now
+        rss = browser_rss(webbot.driver) if webbot and getattr(webbot, "driver", None) else None
+        if rss is not None:
+            with self._lock:
+                self.browser_rss[worker] = rss
+
+    def render(self) -> str:
+        """
+        Returns: The metrics in the OpenMetrics text format.
+        """
+        # Imported here: reporting imports tracing, which imports this module
+        from .reporting import reporter
+
+        now = time.monotonic()
+        with self._lock:
+            while self._finished and now - self._finished[0] > self.throughput_window:
+                self._finished.popleft()
+            recent = len(self._finished)
+            outcomes = dict(self.outcomes)
+            errors = dict(self.errors)
+            retries = dict(self.retries)
+            recoveries = dict(self.recoveries)
+            browser_rss = dict(self.browser_rss)
+            phases = {phase: (list(buckets), total) for phase, (buckets, total) in self.phases.items()}
+            started = self.started
+        finished = sum(outcomes.values())
+        window = min(self.throughput_window, max(time.time() - self.started_at, 1e-9))
+
+        lines = []
+
+        def metric(name, kind, description, samples):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{key}="{escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{suffix}{{{label_text}}} {value}" if label_text
+                             else f"{name}{suffix} {value}")
+
+        metric("beapro_items", "counter", "Items processed, by outcome.",
+               [("_total", {"outcome": outcome}, count) for outcome, count in sorted(outcomes.items())])
+        metric("beapro_errors", "counter", "Item errors, by exception type.",
+               [("_total", {"exception": name}, count) for name, count in sorted(errors.items())])
+        metric("beapro_retries", "counter", "Attempts that failed and were scheduled again, by exception type.",
+               [("_total", {"exception": name}, count) for name, count in sorted(retries.items())])
+        metric("beapro_items_in_flight", "gauge", "Items started and not reported yet.",
+               [("", {}, max(started - finished, 0))])
+        metric("beapro_recoveries", "counter", "Browser recoveries, by level.",
+               [("_total", {"level": level}, count) for level, count in sorted(recoveries.items())])
+        metric("beapro_throughput_items_per_second", "gauge",
+               f"Items reported in the last {self.throughput_window:g} seconds, per second.",
+               [("", {}, round(recent / window, 4))])
+        metric("beapro_start_time_seconds", "gauge", "Unix time the task started.",
+               [("", {}, round(self.started_at, 3))])
+        metric("beapro_browser_rss_bytes", "gauge", "Memory of the browser processes, by worker.",
+               [("", {"worker": worker}, rss) for worker, rss in sorted(browser_rss.items())])
+        metric("beapro_reporting_queue_depth", "gauge", "Orchestrator calls waiting to be sent.",
+               [("", {}, reporter.depth)])
+        metric("beapro_reporting_dropped", "counter", "Orchestrator calls dropped.",
+               [("_total", {}, reporter.dropped)])
+
+        samples = []
+        for phase, (buckets, total) in sorted(phases.items()):
+            cumulative = 0
+            for bound, count in zip(PHASE_BUCKETS + ("+Inf",), buckets):
+                cumulative += count
+                samples.append(("_bucket", {"phase": phase, "le": bound}, cumulative))
+            samples.append(("_count", {"phase": phase}, cumulative))
+            samples.append(("_sum", {"phase": phase}, round(total, 6)))
+        metric("beapro_phase_seconds", "histogram", "Duration of the item phases.", samples)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self):
+        """
+        Rewrites the textfile atomically, so readers never see a partial file.
+        """
+        path = Path(self.textfile)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + ".tmp")
+        temp.write_text(self.render(), encoding="utf-8")
+        os.replace(temp, path)
+
+    def start(self):
+        """
+        Starts the textfile writer and the HTTP endpoint, as configured.
+        """
+        if self._thread or self._server:
+            return
+        self.started_at = time.time()
+        self._stop.clear()
+        if self.textfile:
+            self._thread = threading.Thread(target=self._run, name="metrics", daemon=True)
+            self._thread.start()
+        if self.port:
+            exporter = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    payload = exporter.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", CONTENT_TYPE)
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+
+                def log_message(self, format, *args):
+                    ...
+
+            try:
+                self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+                self._server.daemon_threads = True
+                threading.Thread(target=self._server.serve_forever, name="metrics-http",
+                                 daemon=True).start()
+                logger.info(f"Serving metrics on http://127.0.0.1:{self.port}/metrics")
+            except OSError as ex:
+                self._server = None
+                logger.error(f"Could not serve metrics on port {self.port}: {ex}")
+
+    def _run(self):
+        while True:
+            try:
+                self.write_textfile()
+            except Exception as ex:
+                logger.warning(f"Error writing the metrics textfile: {ex}")
+            if self._stop.wait(self.interval):
+                break
+
+    def stop(self):
+        """
+        Stops exporting. The textfile is written a last time, with the final values.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+            try:
+                self.write_textfile()
+            except Exception as ex:
+                logger.warning(f"Error writing the metrics textfile: {ex}")
+        if self._server:
+            self._server.shutdown()
+            self._server = None
+
+
+"""
+Setting Metrics: textfile and/or HTTP endpoint
+"""
+
+# ./temp is recreated when the task starts. To scrape the metrics over HTTP, set a port, e.g. 9108.
+metrics = MetricsExporter(textfile="./temp/metrics.prom", port=None, interval=15.0)
@@ -0,0 +1,215 @@
+import hashlib
+import logging
+import math
+import re
+import threading
+from .exceptions import BusinessException, InvalidInputException
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+'''
+preflight.py
+    Pre-processing stage of the items, before anything is fetched (process.process_item):
+    - normalize_handle() trims URLs ("https://www.youtube.com/@name/videos"), "@" and spaces,
+      and case-folds the handle.
+    - check() rejects missing values (empty cells, None) and handles that can never be valid
+      YouTube handles with an InvalidInputException, a business error that gets no browser
+      navigation nor screenshot. Channels are fetched by @handle, so URLs by channel ID or legacy
+      name (/channel/<id>, /c/<name>, /user/<name>) are rejected too.
+    - run() fans out repeated channels from a single fetch: the first item fetches, the
+      duplicates get its result (or its business exception) from a bounded memo, waiting for it
+      when the fetch is still running on another worker. Duplicates whose result was evicted
+      from the memo are fetched again. Retries of an item (retry.py) aren't counted as duplicates.
+    Handles are tracked in a streaming seen-set: 8-byte hashes in a set, or a Bloom filter
+    (bloom_capacity) for very large lists, whose rare false positives only cost a memo lookup.
+'''
+
+HANDLE_PATTERN = re.compile(r"[\w.-]{3,30}")
+URL_PATTERN = re.compile(r"^(?:https?://)?(?:[\w-]+\.)*youtube\.com(?=[/?#]|$)(?P<path>/[^?#]*)?", re.I)
+
+
+def normalize_handle(channel) -> str:
+    """
+    Normalizes a channel handle: without URL, "@" and spaces, and case-folded.
+    Returns: "" for a missing value (None, NaN, empty cell). A YouTube URL that doesn't point to
+    an @handle keeps its path from "/" (e.g. "/channel/uc123"), which is never a valid handle.
+    """
+    if channel is None or (isinstance(channel, float) and math.isnan(channel)):
+        return ""
+    handle = str(channel).strip()
+    match = URL_PATTERN.match(handle)
+    if match:
+        segments = [segment for segment in (match["path"] or "").split("/") if segment]
+        if not segments or not segments[0].startswith("@"):
+            return "/" + "/".join(segments).casefold()
+        handle = segments[0]
+    return handle.strip().lstrip("@").casefold()
+
+
+def handle_digest(handle: str) -> bytes:
+    return hashlib.blake2b(handle.encode("utf-8"), digest_size=8).digest()
+
+
+class HashSet():
+    """
+    Exact seen-set of 8-byte handle hashes.
+    """
+
+    def __init__(self):
+        self._seen = set()
+
+    def add(self, handle: str) -> bool:
+        """
+        Returns: True if the handle was seen before.
+        """
+        key = int.from_bytes(handle_digest(handle), "little")
+        if key in self._seen:
+            return True
+        self._seen.add(key)
+        return False
+
+    def __len__(self):
+        return len(self._seen)
+
+
+class BloomFilter():
+    """
+    Seen-set of fixed size: `capacity` handles with a false positive rate of `error_rate`.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, handle: str) -> bool:
+        """
+        Returns: True if the handle was (probably) seen before.
+        """
+        digest = hashlib.blake2b(handle.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        seen = True
+        for i in range(self.hashes):
+            bit = (first + i * second) % self.size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self._bits[byte] & mask:
+                seen = False
+                self._bits[byte] |= mask
+        if not seen:
+            self.count += 1
+        return seen
+
+    def __len__(self):
+        return self.count
+
+
+class Preflight():
+    def __init__(self, memo_size: int = 10_000, bloom_capacity: int = None,
+                 bloom_error_rate: float = 0.001):
+        """
+        Args:
+            memo_size: Results of fetched channels kept for their duplicates.
+            bloom_capacity: Expected distinct handles. Uses a Bloom filter as the seen-set
+                instead of the exact hash set.
+            bloom_error_rate: False positive rate of the Bloom filter at its capacity.
+        """
+        self.memo_size = memo_size
+        self.seen = BloomFilter(bloom_capacity, bloom_error_rate) if bloom_capacity else HashSet()
+        self.invalid = 0
+        self.duplicates = 0
+        self.fanned_out = 0
+        self._memo = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def check(self, channel) -> str:
+        """
+        Returns: Normalized handle of the channel.
+        Raises: InvalidInputException if it can't be a YouTube handle.
+        """
+        handle = normalize_handle(channel)
+        if not HANDLE_PATTERN.fullmatch(handle):
+            with self._lock:
+                self.invalid += 1
+            if not handle:
+                raise InvalidInputException("The channel handle is missing.")
+            if handle.startswith("/"):
+                raise InvalidInputException(
+                    f"'{channel}' is not a YouTube @handle URL. Use the channel's @handle instead.")
+            raise InvalidInputException(f"'{channel}' is not a valid YouTube channel handle.")
+        return handle
+
+    def run(self, handle: str, fetch, retry: bool = False):
+        """
+        Args:
+            retry: The item is another attempt of an item already seen, after a system error.
+                It skips the seen-set and isn't counted as a duplicate.
+        Returns: fetch() for the first item of the handle, its memoized outcome for duplicates.
+        """
+        duplicate = False
+        if not retry:
+            with self._lock:
+                duplicate = self.seen.add(handle)
+                if duplicate:
+                    self.duplicates += 1
+                else:
+                    flight = self._inflight[handle] = threading.Event()
+            if not duplicate:
+                return self._lead(handle, fetch, flight)
+
+        while True:
+            with self._lock:
+                outcome = self._memo.get(handle)
+                if outcome is not None:
+                    self._memo.move_to_end(handle)
+                    if duplicate:
+                        self.fanned_out += 1
+                flight = self._inflight.get(handle) if outcome is None else None
+                if outcome is None and flight is None:
+                    # Evicted from the memo, or the first fetch failed: fetch it again
+                    flight = self._inflight[handle] = threading.Event()
+                    lead = True
+                else:
+                    lead = False
+            if outcome is not None:
+                result, exception = outcome
+                if exception is not None:
+                    raise type(exception)(*exception.args)
+                return result
+            if lead:
+                return self._lead(handle, fetch, flight)
+            flight.wait()
+
+    def _lead(self, handle: str, fetch, flight: threading.Event):
+        try:
+            result = fetch()
+            self._remember(handle, (result, None))
+            return result
+        except BusinessException as ex:
+            self._remember(handle, (None, ex))
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(handle, None)
+            flight.set()
+
+    def _remember(self, handle: str, outcome: tuple):
+        with self._lock:
+            self._memo[handle] = outcome
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    def stats_message(self) -> str:
+        return (f"Preflight: {self.invalid} invalid handles rejected, {self.duplicates} duplicates, "
+                f"{self.fanned_out} served from an earlier fetch.")
+
+
+"""
+Setting Preflight
+"""
+
+# bloom_capacity=50_000_000 switches the seen-set to a Bloom filter (~90 MB at 0.1% false positives).
+preflight = Preflight(memo_size=10_000)
@@ -1,10 +1,16 @@
 import logging
 from .datasources import *  # test
-from .exceptions import BusinessException, InterruptException, SystemException
+from .cache import NOT_FOUND, result_cache
+from .exceptions import (InterruptException, NotFoundException,
+                         SystemException)
+from .extraction import YOUTUBE_URL, ExtractionError, HttpChannelExtractor
+from .preflight import preflight
+from .readiness import PageReadiness
+from .results import ChannelResult
 from .state import STATE
-# from selenium.webdriver.common.by import By
-# Import de Web Bot
-from botcity.web import WebBot, Browser, By
+from .tracing import tracer
+# botcity.web (WebBot, Browser, By) is imported inside the functions that use it, so importing
+# the framework stays fast: from botcity.web import WebBot, Browser, By
 
 logger = logging.getLogger(__name__)
 
@@ -14,36 +20,115 @@ process.py
     Add the steps to your automation process here.
 '''
 
+# Engine used to read the channel metadata:
+#   "webbot": loads the channel page in the browser.
+#   "http": fetches the page over plain HTTP and parses its embedded JSON. Falls back to the
+#           WebBot only when the page can't be parsed.
+EXTRACTION_ENGINE = "webbot"
+http_extractor = HttpChannelExtractor(YOUTUBE_URL)
+# Deadline for a channel page to show its metadata (or a 404 title) in the browser.
+# measure_usage=True also records the bytes transferred and the browser memory per page.
+page_readiness = PageReadiness(timeout=15.0, measure_usage=False)
+
+METADATA_XPATH = '//yt-content-metadata-view-model[@class="yt-page-header-view-model__page-header-content-metadata yt-content-metadata-view-model yt-content-metadata-view-model--inline yt-content-metadata-view-model--medium-text"]'
+
 
 def process_item(item):
     """
     Runs the steps of the automation process for each item and checks if the process has received an interruption request from the BotCity Orchestrator.
     """
-    STATE.raise_for_interrupt_requested()
+    tracer.start_item(item)
+    with tracer.span("interrupt_check"):
+        STATE.raise_for_interrupt_requested()
+
+    with tracer.span("preflight"):
+        channel = preflight.check(item.get("channel"))
+    logger.info("Item processing has started: %s.", channel)
+
+    # Repeated channels get the result of the first fetch. Retries of the item aren't repeats.
+    return preflight.run(channel, lambda: fetch_result(channel),
+                         retry=item.get("ATTEMPTS", 1) > 1)
+
+
+def fetch_result(channel: str) -> ChannelResult:
+    """
+    Reads the channel from the result cache or from YouTube.
+    Returns: ChannelResult of the channel.
+    """
+    if result_cache:
+        with tracer.span("cache"):
+            cached = result_cache.get(channel)
+        if cached == NOT_FOUND:
+            raise NotFoundException(
+                f"The YouTube channel '{channel}' was not found (cached).")
+        if cached:
+            logger.info("Channel '%s' served from the result cache.", channel)
+            return format_result(cached)
+
+    try:
+        data = extract_channel(channel)
+    except NotFoundException:
+        if result_cache:
+            with tracer.span("cache"):
+                result_cache.put_not_found(channel)
+        raise
+    if result_cache:
+        with tracer.span("cache"):
+            result_cache.put(channel, data)
+
+    return format_result(data)
+
+
+def extract_channel(channel: str) -> dict:
+    """
+    Reads the channel metadata with the configured EXTRACTION_ENGINE.
+    Returns: dict with channel_name, subscribers and videos.
+    """
+    data = None
+    if EXTRACTION_ENGINE == "http":
+        try:
+            data = http_extractor.extract(channel)
+        except ExtractionError as ex:
+            logger.warning(
+                f"Could not parse the page of channel '{channel}' ({ex}). Falling back to the WebBot.")
+    if data is None:
+        data = extract_with_webbot(channel)
+    return data
+
+
+def format_result(data: dict) -> ChannelResult:
+    """
+    Builds the result record of a channel from its metadata. str() of it is the result message.
+    """
+    return ChannelResult(data["channel_name"], data["subscribers"], data["videos"])
+
+
+def extract_with_webbot(channel: str) -> dict:
+    """
+    Opens the channel page in the browser and reads the metadata shown in its header.
+    Returns: dict with channel_name, subscribers and videos.
+    """
+    from botcity.web import By
 
-    logger.info(f"Item processing has started: {item}.")
     bot = STATE.webbot
 
-    channel = item.get("channel")
     # Starts the browser
-    bot.browse(f"https://www.youtube.com/@{channel}")
-
-    bot.wait(500)
-    
-    # Find the <title> element and check its text    
-    title_element = bot.page_title()
-    if title_element == "404 Not Found":
-        raise BusinessException(f"The YouTube channel '{channel}' was not found.")
-    
-    element = bot.find_element(
-        selector='//yt-content-metadata-view-model[@class="yt-page-header-view-model__page-header-content-metadata yt-content-metadata-view-model yt-content-metadata-view-model--inline yt-content-metadata-view-model--medium-text"]',
-        by=By.XPATH)
-
-    lines = [line for line in element.text.strip().split('\n')
-             if line.strip() != '•']
-    channel_name = lines[0].strip('@')
-    subscribers = lines[1]
-    videos = lines[2]
-
-    result_message = f"Channel name: {channel_name} | Number of subscribers: {subscribers} | Number of videos: {videos}"
-    return result_message
+    with tracer.span("browse"):
+        bot.browse(f"{YOUTUBE_URL}/@{channel}")
+
+    # Waits for a 404 title or for the metadata element, whichever comes first
+    with tracer.span("wait"):
+        element = page_readiness.wait(bot, selector=METADATA_XPATH, by=By.XPATH)
+    if element is None:
+        raise NotFoundException(f"The YouTube channel '{channel}' was not found.")
+
+    with tracer.span("read_element"):
+        text = element.text
+    with tracer.span("parse"):
+        lines = [line for line in text.strip().split('\n')
+                 if line.strip() != '•']
+    return {
+        "channel_name": lines[0].strip('@'),
+        "subscribers": lines[1],
+        "videos": lines[2],
+    }
@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from .exceptions import SystemException
+from collections import deque
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+'''
+readiness.py
+    Waits for the conditions that make a page usable instead of sleeping for a fixed time.
+    PageReadiness.wait() polls the page until either:
+        - the title says it is a 404 page (short-circuits, no need to wait for the content), or
+        - the awaited element is present and has text,
+    and raises SystemException when neither happens before the deadline.
+    The time to each condition is recorded per item, to tune the deadline from real data.
+    With measure_usage=True, the bytes transferred by the page and the browser memory (RSS, needs
+    psutil) are recorded too, to compare browser profiles.
+'''
+
+# Bytes transferred by the current document and its resources (Navigation and Resource Timing)
+TRANSFER_SIZE_SCRIPT = """
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+return entries.reduce((total, entry) => total + (entry.transferSize || 0), 0);
+"""
+
+NOT_FOUND_TITLE = "404 Not Found"
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Nearest-rank percentile of a list of numbers (q between 0 and 100).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(q / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class PageReadiness():
+    def __init__(self, timeout: float = 15.0, poll_interval: float = 0.05,
+                 history: int = 10000, measure_usage: bool = False):
+        """
+        Args:
+            timeout: Overall deadline for the page to be ready, in seconds.
+            poll_interval: Seconds between condition checks.
+            history: Number of items whose timings are kept for the summary.
+            measure_usage: Also records the transferred bytes and the browser RSS of each page.
+        """
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.measure_usage = measure_usage
+        self.timings = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def wait(self, bot, selector: str, by: str = "xpath"):
+        """
+        Waits for the current page of the WebBot to be ready.
+        Returns: The awaited element, or None if the page is a 404 page.
+        """
+        # Imported here, so importing the framework doesn't load Selenium
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        started = time.monotonic()
+        timing = {}
+
+        def ready(driver):
+            if "title" not in timing and driver.title:
+                timing["title"] = time.monotonic() - started
+            if driver.title == NOT_FOUND_TITLE:
+                return NOT_FOUND_TITLE
+            elements = driver.find_elements(by, selector)
+            if elements and elements[0].text.strip():
+                return elements[0]
+            return False
+
+        try:
+            result = WebDriverWait(bot.driver, self.timeout, poll_frequency=self.poll_interval,
+                                   ignored_exceptions=(WebDriverException,)).until(ready)
+        except TimeoutException:
+            timing["timeout"] = time.monotonic() - started
+            self._record(timing)
+            raise SystemException(
+                f"Page not ready after {self.timeout:g}s: {bot.driver.current_url}")
+
+        condition = "not_found" if result == NOT_FOUND_TITLE else "element"
+        timing[condition] = time.monotonic() - started
+        if self.measure_usage:
+            timing.update(browser_usage(bot.driver))
+        self._record(timing)
+        logger.debug("Page ready (%s): %s", condition, timing)
+        return None if condition == "not_found" else result
+
+    def _record(self, timing: dict):
+        with self._lock:
+            self.timings.append(timing)
+
+    def summary_message(self) -> str:
+        """
+        Percentiles of the time to each condition, over the recorded items.
+        """
+        with self._lock:
+            timings = list(self.timings)
+        if not timings:
+            return ""
+        parts = []
+        for condition in ("title", "element", "not_found", "timeout"):
+            values = [t[condition] * 1000 for t in timings if condition in t]
+            if values:
+                parts.append(
+                    f"{condition} p50 {percentile(values, 50):.0f} ms / p95 {percentile(values, 95):.0f} ms (n={len(values)})")
+        for usage, unit, scale in (("transfer_bytes", "KB", 1024), ("rss_bytes", "MB", 1024 ** 2)):
+            values = [t[usage] / scale for t in timings if usage in t]
+            if values:
+                parts.append(
+                    f"{usage[:-6]} p50 {percentile(values, 50):.0f} {unit} / p95 {percentile(values, 95):.0f} {unit}")
+        return f"Page readiness: {'; '.join(parts)}."
+
+
+def browser_usage(driver) -> dict:
+    """
+    Measures the current page of a Selenium driver.
+    Returns: dict with transfer_bytes (document and resources) and rss_bytes (browser processes,
+    only when psutil is installed). Values that can't be measured are left out.
+    """
+    from selenium.common.exceptions import WebDriverException
+
+    usage = {}
+    try:
+        usage["transfer_bytes"] = int(driver.execute_script(TRANSFER_SIZE_SCRIPT) or 0)
+    except WebDriverException as ex:
+        logger.debug(f"Could not read the transferred bytes: {ex}")
+    rss = browser_rss(driver)
+    if rss is not None:
+        usage["rss_bytes"] = rss
+    return usage
+
+
+def browser_rss(driver) -> int:
+    """
+    Memory of the browser processes started by a Selenium driver.
+    Returns: RSS in bytes, or None without psutil or if it can't be read.
+    """
+    if not psutil:
+        return None
+    try:
+        driver_process = psutil.Process(driver.service.process.pid)
+        return sum(process.memory_info().rss
+                   for process in driver_process.children(recursive=True))
+    except (AttributeError, psutil.Error) as ex:
+        logger.debug(f"Could not read the browser memory: {ex}")
+        return None
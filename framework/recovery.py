@@ -0,0 +1,107 @@
+import logging
+import threading
+import time
+from .initialize import initialize
+from .state import STATE
+
+logger = logging.getLogger(__name__)
+
+'''
+recovery.py
+    Recovers the browser after a SystemException with the cheapest step that works, instead of
+    always restarting it. The level used depends on the consecutive failures of the worker:
+        1. blank_page: closes extra tabs and navigates to about:blank.
+        2. reset_session: opens a fresh tab and clears cookies and site storage.
+        3. restart_browser: full restart, initialize(restart=True).
+    If a level fails, the next one is tried. A success (or a business exception, which means the
+    page loaded) resets the count. The level used and its cost are logged.
+'''
+
+LEVELS = ("blank_page", "reset_session", "restart_browser")
+
+
+class RecoveryLadder():
+    def __init__(self, escalation: tuple = (1, 2, 3)):
+        """
+        Args:
+            escalation: Consecutive failures from which each level (blank_page, reset_session,
+                restart_browser) is used.
+        """
+        self.escalation = escalation
+        self.counts = dict.fromkeys(LEVELS, 0)
+        self._lock = threading.Lock()
+        # Consecutive failures are counted per worker thread
+        self._local = threading.local()
+
+    @property
+    def failures(self) -> int:
+        return getattr(self._local, "failures", 0)
+
+    def reset(self):
+        """
+        Registers that the browser is healthy again.
+        """
+        self._local.failures = 0
+
+    def recover(self) -> str:
+        """
+        Recovers the browser of the current thread after a failure.
+        Returns: Name of the level that succeeded.
+        """
+        self._local.failures = self.failures + 1
+        start = max((level for level, threshold in enumerate(self.escalation)
+                     if self.failures >= threshold), default=0)
+        for level in range(start, len(LEVELS)):
+            name = LEVELS[level]
+            started = time.monotonic()
+            try:
+                getattr(self, name)()
+            except Exception as ex:
+                if level == len(LEVELS) - 1:
+                    raise
+                logger.warning(f"Recovery {name} failed ({ex}). Escalating.")
+                continue
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self.counts[name] += 1
+            logger.info(
+                f"Recovered with {name} after {self.failures} consecutive failures in {elapsed * 1000:.0f} ms. "
+                f"Recoveries so far: {self.counts}.")
+            if name == "restart_browser":
+                self.reset()
+            return name
+
+    def blank_page(self):
+        driver = STATE.webbot.driver
+        if driver is None:
+            # The browser isn't running. It will be started by the next browse()
+            return
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+
+    def reset_session(self):
+        driver = STATE.webbot.driver
+        if driver is None:
+            return
+        # Cookies and storage are cleared for the site of the failed page, before leaving it
+        driver.delete_all_cookies()
+        driver.execute_script(
+            "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        old_handles = driver.window_handles
+        driver.switch_to.new_window("tab")
+        fresh = driver.current_window_handle
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh)
+        driver.get("about:blank")
+
+    def restart_browser(self):
+        initialize(restart=True)
+
+
+recovery = RecoveryLadder()
@@ -0,0 +1,271 @@
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+from .tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+'''
+reporting.py
+    Outbound queue for the BotCity Orchestrator calls made while items are processed
+    (alerts, errors, datapool reports, log entries), so a slow or flaky Orchestrator doesn't
+    stall the item loop.
+    - A background sender makes the calls in submission order, retrying failures with backoff
+      (at-least-once delivery: a call that timed out after reaching the server may be repeated).
+    - Critical calls (datapool reports) are never dropped: after a failure they wait apart, so
+      the other calls go on, and are retried with backoff until delivered. drain() logs each
+      critical call still undelivered at its deadline.
+    - Alerts with the same title and type that are waiting together are coalesced into one alert.
+    - drain() waits for the pending calls with a deadline; finalize() calls it before finishing the task.
+    - depth, latency and drop counts are exposed for monitoring.
+'''
+
+
+class ReportingQueue():
+    def __init__(self, maxsize: int = 10000, max_retries: int = 5,
+                 backoff: float = 1.0, max_backoff: float = 30.0, batch_size: int = 100):
+        """
+        Args:
+            maxsize: Maximum pending calls. Non-critical calls are dropped when it is full,
+                critical ones (e.g. datapool reports) wait for room.
+            max_retries: Retries of a failed non-critical call before it is dropped. Critical
+                calls are retried until they are delivered.
+            backoff: Base delay of the exponential backoff between retries, in seconds.
+            max_backoff: Maximum delay between retries, in seconds.
+            batch_size: Maximum calls taken from the queue at once, where alerts are coalesced.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+        self.sent = 0
+        self.retried = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self._queue = queue.Queue(maxsize)
+        # Critical calls waiting for another attempt: (due time, sequence, attempt, call)
+        self._retries = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def depth(self) -> int:
+        """
+        Calls waiting to be sent, the critical calls waiting for a retry included.
+        """
+        return self._queue.qsize() + len(self._retries)
+
+    @property
+    def latency_avg(self) -> float:
+        """
+        Average duration of the Orchestrator calls, in seconds.
+        """
+        return self.latency_total / self.sent if self.sent else 0.0
+
+    def submit(self, name: str, fn, *args, critical: bool = False, **kwargs) -> bool:
+        """
+        Queues fn(*args, **kwargs) to be called by the sender.
+        Returns: False if the call was dropped because the queue is full.
+        """
+        self._ensure_started()
+        call = (name, fn, args, kwargs, critical)
+        if critical:
+            self._queue.put(call)
+            return True
+        try:
+            self._queue.put_nowait(call)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.warning(f"Reporting queue is full. Dropped {name}.")
+            return False
+
+    def alert(self, maestro, task_id, title: str, message: str, alert_type):
+        """
+        Queues an alert. Alerts with the same title and type waiting together are sent as one.
+        """
+        return self.submit("alert", maestro.alert, task_id=task_id,
+                           title=title, message=message, alert_type=alert_type)
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="reporting-queue", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self._next_retry_in())]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for call in self._coalesce(batch):
+                self._send(call)
+            for _ in batch:
+                self._queue.task_done()
+            self._send_retries()
+
+    def _next_retry_in(self):
+        """
+        Returns: Seconds until the next critical retry is due, None to wait for a new call.
+        """
+        with self._lock:
+            if not self._retries:
+                return None
+            return max(0.0, self._retries[0][0] - time.monotonic())
+
+    def _send_retries(self):
+        """
+        Makes another attempt of the critical calls that are due. They stay in the retry heap
+        until delivered, so drain() keeps waiting for them.
+        """
+        while True:
+            with self._lock:
+                if not self._retries or self._retries[0][0] > time.monotonic():
+                    return
+                _, _, attempts, call = self._retries[0]
+            error = self._attempt(call)
+            if error is None:
+                with self._lock:
+                    heapq.heappop(self._retries)
+            else:
+                self._retry_later(call, attempts + 1, error, replace=True)
+
+    def _retry_later(self, call, attempts: int, error: Exception, replace: bool = False):
+        """
+        Schedules another attempt of a critical call after the backoff of `attempts` failures.
+        replace: The call is the head of the retry heap, and takes its place.
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+        entry = (time.monotonic() + delay, next(self._sequence), attempts, call)
+        with self._lock:
+            self.retried += 1
+            if replace:
+                heapq.heapreplace(self._retries, entry)
+            else:
+                heapq.heappush(self._retries, entry)
+        logger.warning(f"Error sending {call[0]}: {error}. Retrying in {delay:.1f}s.")
+
+    def _coalesce(self, batch: list) -> list:
+        """
+        Merges the alerts of a batch with the same target, title and type into the first of them.
+        """
+        calls = []
+        alerts = {}
+        for name, fn, args, kwargs, critical in batch:
+            if name != "alert":
+                calls.append((name, fn, args, kwargs, critical))
+                continue
+            key = (fn, kwargs["task_id"], kwargs["title"], kwargs["alert_type"])
+            if key in alerts:
+                alerts[key].append(kwargs["message"])
+                continue
+            alerts[key] = [kwargs["message"]]
+            calls.append((name, fn, args, kwargs, critical))
+
+        for index, (name, fn, args, kwargs, critical) in enumerate(calls):
+            if name != "alert":
+                continue
+            messages = alerts[(fn, kwargs["task_id"], kwargs["title"], kwargs["alert_type"])]
+            if len(messages) > 1:
+                with self._lock:
+                    self.coalesced += len(messages) - 1
+                shown = "\n".join(str(message) for message in messages[:5])
+                more = f"\n... and {len(messages) - 5} more." if len(messages) > 5 else ""
+                calls[index] = (name, fn, args, dict(
+                    kwargs, title=f"{kwargs['title']} (x{len(messages)})", message=shown + more), critical)
+        return calls
+
+    def _send(self, call):
+        name, fn, args, kwargs, critical = call
+        for attempt in range(self.max_retries + 1):
+            error = self._attempt(call)
+            if error is None:
+                return
+            if critical:
+                # Waits apart from the queue, so the calls behind it aren't held up
+                self._retry_later(call, attempt + 1, error)
+                return
+            if attempt == self.max_retries:
+                with self._lock:
+                    self.dropped += 1
+                logger.error(
+                    f"Dropped {name} after {attempt + 1} attempts: {error}")
+                return
+            with self._lock:
+                self.retried += 1
+            delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+            logger.warning(f"Error sending {name}: {error}. Retrying in {delay:.1f}s.")
+            time.sleep(delay)
+
+    def _attempt(self, call) -> Exception:
+        """
+        Makes the call once.
+        Returns: The error, None if it was sent.
+        """
+        name, fn, args, kwargs, _ = call
+        started = time.monotonic()
+        try:
+            fn(*args, **kwargs)
+        except Exception as ex:
+            return ex
+        elapsed = time.monotonic() - started
+        # Timed apart from the items: the calls are made by this thread, after the item moved on
+        tracer.observe(f"orchestrator.{name}", elapsed)
+        with self._lock:
+            self.sent += 1
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+        return None
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """
+        Waits until every queued call was sent or dropped, and every critical call delivered, up
+        to timeout seconds. Logs each call still undelivered at the deadline.
+        Returns: True if the queue was drained in time.
+        """
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks or self._retries:
+            if time.monotonic() >= deadline:
+                self._log_undelivered(timeout)
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _log_undelivered(self, timeout: float):
+        with self._queue.mutex:
+            queued = list(self._queue.queue)
+        with self._lock:
+            retrying = [(attempt, call) for _, _, attempt, call in sorted(self._retries)]
+        logger.error(
+            f"Reporting queue not drained in {timeout:.0f}s: {len(queued) + len(retrying)} calls not sent.")
+        for attempt, (name, _, args, kwargs, critical) in retrying:
+            logger.critical(f"UNDELIVERED critical {name} after {attempt} attempts: args={args}, kwargs={kwargs}")
+        for name, _, args, kwargs, critical in queued:
+            level = logging.CRITICAL if critical else logging.ERROR
+            logger.log(level, f"UNDELIVERED {'critical ' if critical else ''}{name}, never sent: "
+                              f"args={args}, kwargs={kwargs}")
+
+    def stats_message(self) -> str:
+        return (f"Reporting queue: {self.sent} calls sent (avg {self.latency_avg * 1000:.0f} ms, "
+                f"max {self.latency_max * 1000:.0f} ms), {self.coalesced} alerts coalesced, "
+                f"{self.retried} retries, {self.dropped} dropped, {self.depth} pending.")
+
+
+reporter = ReportingQueue()
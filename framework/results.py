@@ -0,0 +1,193 @@
+import datetime
+import logging
+import threading
+from .state import STATE
+from dataclasses import asdict, dataclass
+
+logger = logging.getLogger(__name__)
+
+'''
+results.py
+    Structured result of a channel and its optional columnar output.
+    - ChannelResult is what process_item() returns. str() gives the result message of the MESSAGE
+      column, as before.
+    - parse_counts() turns abbreviated, localized counts ("1.2M subscribers", "14,5 mil vídeos",
+      "12 Mio. Abonnenten", "1.234 Videos") into integers, a whole batch at a time with Arrow.
+    - ColumnarResultWriter writes every reported row, with typed SUBSCRIBERS/VIDEOS counts, to a
+      Parquet or Arrow IPC file next to the result CSV. It needs pyarrow (pip install pyarrow)
+      and turns itself off without it.
+'''
+
+# Multiplier of the abbreviation after a count, case-folded and without its trailing "."
+COUNT_MULTIPLIERS = {
+    "k": 1e3, "m": 1e6, "b": 1e9,        # en, fr, es
+    "mil": 1e3, "mi": 1e6, "bi": 1e9,    # pt, es
+    "tsd": 1e3, "mio": 1e6, "mrd": 1e9,  # de
+    "md": 1e9, "mln": 1e6, "mld": 1e9,   # fr, it, pl
+    "tys": 1e3,                          # pl
+    "万": 1e4, "億": 1e8, "亿": 1e8,        # ja, zh
+}
+# Number, then its abbreviation: a CJK unit ("1.2万人") or the first letters of the next word.
+# Explicit classes instead of \s and \pL keep the regex engine on its fast path.
+COUNT_PATTERN = r"(?P<number>[0-9][0-9., \x{00a0}\x{202f}]*)(?P<unit>[万億亿]|[^0-9., \x{00a0}\x{202f}万億亿]{0,4})"
+
+
+@dataclass(frozen=True)
+class ChannelResult:
+    channel_name: str
+    subscribers: str
+    videos: str
+
+    def __str__(self):
+        return f"Channel name: {self.channel_name} | Number of subscribers: {self.subscribers} | Number of videos: {self.videos}"
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def parse_counts(texts):
+    """
+    Parses the counts shown by YouTube, e.g. "1.2M subscribers" or "1,234 videos", with Arrow
+    compute kernels over the whole batch.
+    With an abbreviation, "," is a decimal separator ("1,2 mi"); without one, "." and "," are
+    thousands separators ("1.234").
+    Returns: pyarrow int64 Array, null where there is no count or it can't be read ("1.234,5 mil").
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    texts = pa.array(texts, pa.string())
+    parts = pc.extract_regex(texts, COUNT_PATTERN)
+    number = pc.replace_substring_regex(pc.struct_field(parts, "number"), r"[ \x{00a0}\x{202f}]", "")
+    unit = pc.utf8_lower(pc.struct_field(parts, "unit"))
+    multiplier = pc.take(pa.array(list(COUNT_MULTIPLIERS.values()), pa.float64()),
+                         pc.index_in(unit, value_set=pa.array(list(COUNT_MULTIPLIERS))))
+    number = pc.if_else(pc.is_valid(multiplier),
+                        pc.replace_substring(number, ",", "."),
+                        pc.replace_substring_regex(number, r"[.,]", ""))
+    # Anything but digits with one decimal point (e.g. "1.234.5") is left out, instead of failing the cast
+    number = pc.if_else(pc.match_substring_regex(number, r"^[0-9]+(\.[0-9]+)?$"),
+                        number, pa.scalar(None, pa.string()))
+    values = pc.multiply(pc.cast(number, pa.float64()), pc.coalesce(multiplier, 1.0))
+    return pc.cast(pc.round(values), pa.int64())
+
+
+class ColumnarResultWriter():
+    """
+    Buffers the reported rows and writes them in batches of batch_size (one row group each).
+    """
+
+    def __init__(self, file: str, header: list, file_format: str = "parquet",
+                 batch_size: int = 10000):
+        """
+        Args:
+            file: Output file, without extension.
+            header: Input columns, written as strings.
+            file_format: "parquet" or "arrow" (Arrow IPC file).
+            batch_size: Rows parsed and written at a time.
+        """
+        self.file = f"{file}.{'parquet' if file_format == 'parquet' else 'arrow'}"
+        self.header = list(header)
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.rows = 0
+        self.enabled = True
+        self._batch = []
+        self._writer = None
+        self._schema = None
+        self._lock = threading.Lock()
+
+    def write_row(self, row: dict, result: ChannelResult = None):
+        if not self.enabled:
+            return
+        values = {column: row.get(column) for column in self.header}
+        values.update({
+            "TIMESTAMP": row.get("TIMESTAMP"),
+            "STATUS": row.get("STATUS"),
+            "MESSAGE": str(row.get("MESSAGE", "")),
+            "ATTEMPTS": row.get("ATTEMPTS"),
+            "CHANNEL_NAME": result.channel_name if result else None,
+            "SUBSCRIBERS_TEXT": result.subscribers if result else None,
+            "VIDEOS_TEXT": result.videos if result else None,
+        })
+        with self._lock:
+            self._batch.append(values)
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+
+    def _flush(self):
+        """
+        Writes the buffered rows. Called from the reporting path, so errors are logged and turn
+        the columnar output off instead of failing the item.
+        """
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            logger.warning(f"pyarrow isn't installed: the columnar output {self.file} is disabled.")
+            self.enabled = False
+            return
+        try:
+            self._write(batch, pa, pc)
+        except Exception as ex:
+            logger.error(f"Error writing {len(batch)} results to {self.file}: {ex}. "
+                         "The columnar output is disabled, the result CSV is complete.")
+            self.enabled = False
+
+    def _write(self, batch: list, pa, pc):
+        if self._schema is None:
+            self._schema = pa.schema(
+                [pa.field(column, pa.string()) for column in self.header]
+                + [pa.field("TIMESTAMP", pa.timestamp("us")), pa.field("STATUS", pa.string()),
+                   pa.field("MESSAGE", pa.string()), pa.field("ATTEMPTS", pa.int32()),
+                   pa.field("CHANNEL_NAME", pa.string()),
+                   pa.field("SUBSCRIBERS", pa.int64()), pa.field("VIDEOS", pa.int64()),
+                   pa.field("SUBSCRIBERS_TEXT", pa.string()), pa.field("VIDEOS_TEXT", pa.string())])
+        columns = {name: [row[name] for row in batch] for name in batch[0]}
+        # Missing input values (None, NaN) are written as nulls
+        arrays = [pa.array([None if value is None or value != value else str(value) for value in columns[column]],
+                           pa.string())
+                  for column in self.header]
+        arrays += [
+            pc.cast(pa.array(columns["TIMESTAMP"], pa.string()), pa.timestamp("us")),
+            pa.array(columns["STATUS"], pa.string()),
+            pa.array(columns["MESSAGE"], pa.string()),
+            pa.array(columns["ATTEMPTS"], pa.int32()),
+            pa.array(columns["CHANNEL_NAME"], pa.string()),
+            parse_counts(columns["SUBSCRIBERS_TEXT"]),
+            parse_counts(columns["VIDEOS_TEXT"]),
+            pa.array(columns["SUBSCRIBERS_TEXT"], pa.string()),
+            pa.array(columns["VIDEOS_TEXT"], pa.string()),
+        ]
+        table = pa.Table.from_arrays(arrays, schema=self._schema)
+        if self._writer is None:
+            if self.file_format == "parquet":
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.file, self._schema, compression="zstd")
+            else:
+                self._writer = pa.ipc.new_file(self.file, self._schema)
+        self._writer.write_table(table)
+        self.rows += len(batch)
+
+    def close(self):
+        with self._lock:
+            if self.enabled:
+                self._flush()
+            if self._writer is not None:
+                try:
+                    self._writer.close()
+                    logger.info(f"{self.rows} results written to {self.file}.")
+                except Exception as ex:
+                    logger.error(f"Error closing {self.file}: {ex}")
+                self._writer = None
+
+
+def columnar_result_file(directory: str = "./output") -> str:
+    """
+    Returns: Path of the columnar output, without extension.
+    """
+    date = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M")
+    return f"{directory}/Results_BotCity_task-{STATE.task_id}_date-{date}"
@@ -0,0 +1,290 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from .exceptions import InterruptException
+from .metrics import metrics
+from .state import STATE
+from .tracing import tracer
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+'''
+retry.py
+    Retries the items that failed with a system error (timeouts, throttling...) instead of
+    reporting them failed right away.
+    - retry_scheduler.items(data_source) iterates the data source, handing out the failed items
+      again once their delay is over: exponential backoff with jitter, up to max_attempts per item.
+    - retry() is called by the item loop on a system error. It returns False when the item is out
+      of attempts, and the error is then reported as usual.
+    - A circuit breaker pauses the fetching when the failure rate of the last breaker_window
+      items reaches breaker_threshold. After the pause one item probes the site: a failure trips
+      the breaker again, with a longer pause.
+    The attempts of each item are written to the ATTEMPTS column of the result CSV. Attempts,
+    retries and breaker trips are added to the finish message.
+'''
+
+
+class CircuitBreaker():
+    def __init__(self, window: int = 20, threshold: float = 0.5, min_items: int = 10,
+                 pause: float = 60.0, max_pause: float = 900.0):
+        """
+        Args:
+            window: Last items whose outcome is considered.
+            threshold: Failure rate of the window that trips the breaker.
+            min_items: Outcomes needed in the window before it can trip.
+            pause: Seconds the fetching is paused on the first trip. Doubles on each consecutive trip.
+            max_pause: Longest pause, in seconds.
+        """
+        self.threshold = threshold
+        self.min_items = min(min_items, window)
+        self.pause = pause
+        self.max_pause = max_pause
+        self.trips = 0
+        self.paused_seconds = 0.0
+        self.open_until = 0.0
+        self._consecutive = 0
+        self._half_open = False
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, failed: bool):
+        with self._lock:
+            if self._half_open:
+                # Outcome of the probe after a pause
+                self._half_open = False
+                if failed:
+                    self._trip()
+                else:
+                    self._consecutive = 0
+                return
+            self._outcomes.append(failed)
+            if (len(self._outcomes) >= self.min_items
+                    and sum(self._outcomes) / len(self._outcomes) >= self.threshold):
+                self._trip()
+
+    def _trip(self):
+        self._consecutive += 1
+        self.trips += 1
+        pause = min(self.max_pause, self.pause * 2 ** (self._consecutive - 1))
+        self.open_until = time.monotonic() + pause
+        self.paused_seconds += pause
+        self._outcomes.clear()
+        self._half_open = True
+        logger.warning(f"Circuit breaker tripped ({self.trips} trips): pausing for {pause:.0f}s.")
+
+    def remaining(self) -> float:
+        """
+        Returns: Seconds left in the current pause, 0 when closed.
+        """
+        return max(0.0, self.open_until - time.monotonic())
+
+
+class RetryScheduler():
+    def __init__(self, max_attempts: int = 3, base_delay: float = 10.0, max_delay: float = 300.0,
+                 jitter: float = 0.5, breaker: CircuitBreaker = None):
+        """
+        Args:
+            max_attempts: Attempts per item, the first one included. 1 disables the retries.
+            base_delay: Seconds before the first retry. Doubles on each retry.
+            max_delay: Longest delay before a retry, in seconds.
+            jitter: Fraction of the delay taken off at random, so the retries don't come in bursts.
+            breaker: CircuitBreaker of the fetching. None disables it.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.breaker = breaker
+        self.source = None
+        self.retried = 0
+        self.recovered = 0
+        self.exhausted = 0
+        self._pending = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._exhausted_source = False
+        # Items pulled from the source during a breaker pause: (item, token)
+        self._ahead = deque()
+
+    def items(self, source):
+        """
+        Returns: Iterator over the items of the source and the retries, shared by the workers.
+        """
+        self.source = source
+        self._exhausted_source = False
+        self._ahead.clear()
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            if self.breaker and self.breaker.remaining() > 0:
+                # Pause only if there is work left
+                self._prefetch()
+                with self._lock:
+                    if self._exhausted_source and not self._pending and not self._ahead:
+                        raise StopIteration
+                self._wait_breaker()
+            with self._lock:
+                due = self._pending and self._pending[0][0] <= time.monotonic()
+                ahead = not due and bool(self._ahead)
+                exhausted = self._exhausted_source
+                if due:
+                    _, _, item, token, attempts, _ = heapq.heappop(self._pending)
+                elif ahead:
+                    item, token = self._ahead.popleft()
+                    attempts = 0
+                elif exhausted:
+                    if not self._pending:
+                        raise StopIteration
+                    wait = self._pending[0][0] - time.monotonic()
+            if due or ahead:
+                # Restores the item as if the source had just handed it out
+                self.source.resume(token)
+                STATE.item = item
+                item["ATTEMPTS"] = attempts + 1
+                return item
+            if exhausted:
+                self._sleep(wait)
+                continue
+            try:
+                item = next(self.source)
+            except StopIteration:
+                with self._lock:
+                    self._exhausted_source = True
+                continue
+            item["ATTEMPTS"] = 1
+            return item
+
+    def _prefetch(self):
+        """
+        Pulls the next item of the source ahead of the breaker pause, unless other work is
+        already waiting, to find out whether the source is exhausted.
+        """
+        with self._lock:
+            if self._exhausted_source or self._ahead or self._pending:
+                return
+        try:
+            item = next(self.source)
+        except StopIteration:
+            with self._lock:
+                self._exhausted_source = True
+            return
+        with self._lock:
+            self._ahead.append((item, self.source.suspend()))
+
+    def _wait_breaker(self):
+        while self.breaker and self.breaker.remaining() > 0:
+            self._sleep(self.breaker.remaining())
+
+    def _sleep(self, seconds: float):
+        """
+        Sleeps in steps of at most 1s. On an interruption request it returns right away, so the
+        next item raises the InterruptException in the item loop.
+        """
+        end = time.monotonic() + seconds
+        while (left := end - time.monotonic()) > 0:
+            try:
+                STATE.raise_for_interrupt_requested()
+            except InterruptException:
+                with self._lock:
+                    # Hand out the pending retries now, they stop at the interruption check
+                    self._pending = [(0.0, *entry[1:]) for entry in self._pending]
+                    heapq.heapify(self._pending)
+                if self.breaker:
+                    self.breaker.open_until = 0.0
+                return
+            time.sleep(min(left, 1.0))
+
+    def delay(self, attempts: int) -> float:
+        """
+        Returns: Seconds before the next attempt of an item that failed `attempts` times.
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def retry(self, item: dict, exception: Exception) -> bool:
+        """
+        Schedules the item of the current thread for another attempt after a system error.
+        Returns: False if the item is out of attempts, and the error must be reported.
+        """
+        if self.breaker:
+            self.breaker.record(failed=True)
+        attempts = item.get("ATTEMPTS", 1)
+        if attempts >= self.max_attempts or self.source is None:
+            if attempts > 1:
+                with self._lock:
+                    self.exhausted += 1
+            return False
+        delay = self.delay(attempts)
+        token = self.source.suspend()
+        with self._lock:
+            heapq.heappush(self._pending,
+                           (time.monotonic() + delay, next(self._sequence), item, token, attempts, exception))
+            self.retried += 1
+        logger.warning("System Exception %s on attempt %s of %s. Retrying in %.1fs.",
+                       exception, attempts, self.max_attempts, delay)
+        tracer.finish_item("retry")
+        metrics.item_retried(exception)
+        return True
+
+    def record(self, item: dict, failed: bool = False):
+        """
+        Records the outcome of an item that won't be retried (success or business error).
+        """
+        if self.breaker:
+            self.breaker.record(failed)
+        if not failed and item.get("ATTEMPTS", 1) > 1:
+            with self._lock:
+                self.recovered += 1
+
+    def close(self):
+        """
+        Reports the items still waiting for a retry with their last error, e.g. after an
+        interruption. Called by finalize() before the data source is closed.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            ahead, self._ahead = list(self._ahead), deque()
+        for item, token in ahead:
+            # Pulled during a breaker pause and never handed out
+            self.source.resume(token)
+            STATE.item = item
+            self.source.report_error(
+                "SYSTEM EXCEPTION", "Not processed: the task stopped during a circuit breaker pause.")
+        for _, _, item, token, attempts, exception in pending:
+            self.source.resume(token)
+            STATE.item = item
+            STATE.register_error()
+            self.source.report_error(
+                "SYSTEM EXCEPTION", f"{exception} (not retried after attempt {attempts})")
+            # Final outcome of the item, as status_handling reports it
+            tracer.start_item(item)
+            tracer.finish_item("system_exception")
+            metrics.item_finished("system_exception", exception)
+        if pending:
+            logger.warning(f"{len(pending)} items waiting for a retry were reported as failed.")
+
+    def stats_message(self) -> str:
+        message = (f"Retries: {self.retried} retries, {self.recovered} items succeeded after a retry, "
+                   f"{self.exhausted} out of attempts.")
+        if self.breaker and self.breaker.trips:
+            message += (f" Circuit breaker: {self.breaker.trips} trips, "
+                        f"{self.breaker.paused_seconds:.0f}s paused.")
+        return message
+
+
+"""
+Setting Retries
+"""
+
+# max_attempts=1 disables the retries, breaker=None the circuit breaker.
+retry_scheduler = RetryScheduler(
+    max_attempts=3, base_delay=10.0, max_delay=300.0, jitter=0.5,
+    breaker=CircuitBreaker(window=20, threshold=0.5, min_items=10, pause=60.0))
@@ -0,0 +1,204 @@
+import datetime
+import hashlib
+import io
+import itertools
+import logging
+import threading
+import time
+from .reporting import reporter
+from .state import STATE
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+'''
+screenshots.py
+    Screenshot policy of the error reports (status_handling.screenshot_error_report):
+    - Captures the browser viewport through the WebDriver instead of the whole desktop.
+    - Rate limits the screenshots per exception type. The most specific class configured in
+      rate_limits wins, and 0 never takes a screenshot (e.g. a 404 page adds nothing).
+    - Skips screenshots identical to a recent one (content hash). The error then references the
+      screenshot already uploaded in its tags.
+    - Encodes (JPEG by default, with Pillow) and saves the image on a background thread, which
+      then queues the error report. The item thread only captures and hashes.
+    - Filenames are unique per item: error-<timestamp>-<sequence>-<exception>.<ext> in ./temp.
+    The error is always reported, with or without a screenshot.
+'''
+
+
+class ScreenshotPolicy():
+    def __init__(self, rate_limits: dict = None, directory: str = "./temp",
+                 image_format: str = "JPEG", quality: int = 60, dedup_history: int = 1000,
+                 max_pending: int = 20, desktop_fallback: bool = False):
+        """
+        Args:
+            rate_limits: Screenshots per minute by exception class name. Classes not covered by
+                any entry (through their base classes) get no screenshot.
+            directory: Folder of the screenshot files.
+            image_format: Pillow format the screenshots are encoded to ("JPEG", "WEBP", "PNG").
+                Without Pillow, the PNG of the browser is saved as it is.
+            quality: Encoding quality for lossy formats.
+            dedup_history: Hashes of recent screenshots kept for deduplication.
+            max_pending: Screenshots waiting to be encoded. Above it, screenshots are skipped.
+            desktop_fallback: Takes a desktop screenshot (slow) when there is no browser.
+        """
+        self.rate_limits = rate_limits if rate_limits is not None else {"Exception": 30}
+        self.directory = directory
+        self.image_format = image_format if Image else "PNG"
+        self.quality = quality
+        self.dedup_history = dedup_history
+        self.desktop_fallback = desktop_fallback
+        self.captured = 0
+        self.deduplicated = 0
+        self.rate_limited = 0
+        self.skipped = 0
+        self._tokens = {}
+        self._seen = OrderedDict()
+        self._sequence = itertools.count(1)
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def rate_limit(self, exception: Exception) -> float:
+        """
+        Returns: Screenshots per minute allowed for the type of the exception.
+        """
+        for cls in type(exception).__mro__:
+            if cls.__name__ in self.rate_limits:
+                return self.rate_limits[cls.__name__]
+        return 0
+
+    def allow(self, exception: Exception) -> bool:
+        """
+        Token bucket per exception type, with a burst of one minute worth of screenshots.
+        """
+        per_minute = self.rate_limit(exception)
+        if per_minute <= 0:
+            return False
+        name = type(exception).__name__
+        now = time.monotonic()
+        with self._lock:
+            tokens, refilled = self._tokens.get(name, (per_minute, now))
+            tokens = min(per_minute, tokens + (now - refilled) * per_minute / 60)
+            allowed = tokens >= 1
+            self._tokens[name] = (tokens - 1 if allowed else tokens, now)
+            if not allowed:
+                self.rate_limited += 1
+        return allowed
+
+    def capture(self):
+        """
+        Returns: PNG of the current thread's browser viewport, or None without a browser.
+        """
+        webbot = STATE.webbot
+        driver = getattr(webbot, "driver", None) if webbot else None
+        if driver is None:
+            return None
+        return driver.get_screenshot_as_png()
+
+    def report_error(self, exception: Exception):
+        """
+        Reports the exception to the BotCity Orchestrator, with a screenshot if the policy allows it.
+        """
+        maestro = STATE.maestro
+        task_id = STATE.task_id
+        kind = type(exception).__name__
+        if not self.allow(exception):
+            reporter.submit("error", maestro.error, task_id=task_id, exception=exception)
+            return
+
+        try:
+            png = self.capture()
+            if png is None and self.desktop_fallback and STATE.desktopbot:
+                path = self.screenshot_path(kind, "png")
+                STATE.desktopbot.save_screenshot(str(path))
+                reporter.submit("error", maestro.error, task_id=task_id,
+                                exception=exception, screenshot=str(path))
+                return
+        except Exception as ex:
+            logger.error(f"Error: {ex}. Uploading error without a screenshot.")
+            png = None
+        if png is None:
+            reporter.submit("error", maestro.error, task_id=task_id, exception=exception)
+            return
+
+        digest = hashlib.blake2b(png, digest_size=16).hexdigest()
+        with self._lock:
+            duplicate = self._seen.get(digest)
+            if duplicate:
+                self._seen.move_to_end(digest)
+                self.deduplicated += 1
+        if duplicate:
+            reporter.submit("error", maestro.error, task_id=task_id, exception=exception,
+                            tags={"screenshot": duplicate})
+            return
+
+        if not self._pending.acquire(blocking=False):
+            with self._lock:
+                self.skipped += 1
+            reporter.submit("error", maestro.error, task_id=task_id, exception=exception)
+            return
+        path = self.screenshot_path(kind, "jpg" if self.image_format == "JPEG" else self.image_format.lower())
+        with self._lock:
+            self._seen[digest] = path.name
+            if len(self._seen) > self.dedup_history:
+                self._seen.popitem(last=False)
+            self.captured += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshots")
+        self._executor.submit(self._save_and_report, png, path, maestro, task_id, exception)
+
+    def screenshot_path(self, kind: str, extension: str) -> Path:
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")[:-3]
+        return Path(self.directory) / f"error-{timestamp}-{next(self._sequence):06d}-{kind}.{extension}"
+
+    def _save_and_report(self, png: bytes, path: Path, maestro, task_id, exception: Exception):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if self.image_format == "PNG":
+                path.write_bytes(png)
+            else:
+                image = Image.open(io.BytesIO(png)).convert("RGB")
+                image.save(path, self.image_format, quality=self.quality)
+            reporter.submit("error", maestro.error, task_id=task_id,
+                            exception=exception, screenshot=str(path))
+        except Exception as ex:
+            logger.error(f"Error saving the screenshot {path}: {ex}. Uploading error without a screenshot.")
+            reporter.submit("error", maestro.error, task_id=task_id, exception=exception)
+        finally:
+            self._pending.release()
+
+    def drain(self):
+        """
+        Waits for the screenshots being encoded, so their errors are queued before the reporting
+        queue is drained. Called by finalize().
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+        logger.info(self.stats_message())
+
+    def stats_message(self) -> str:
+        return (f"Screenshots: {self.captured} taken, {self.deduplicated} duplicates skipped, "
+                f"{self.rate_limited} rate limited, {self.skipped} skipped while busy.")
+
+
+"""
+Setting Screenshots: rate limits per exception type
+"""
+
+# Screenshots per minute by exception class. The most specific class listed applies, 0 disables them.
+SCREENSHOT_RATE_LIMITS = {
+    "NotFoundException": 0,
+    "InvalidInputException": 0,
+    "BusinessException": 6,
+    "Exception": 30,
+}
+screenshots = ScreenshotPolicy(rate_limits=SCREENSHOT_RATE_LIMITS, image_format="JPEG", quality=60)
@@ -0,0 +1,113 @@
+import argparse
+import csv
+import glob
+import gzip
+import hashlib
+import logging
+from .preflight import normalize_handle
+from .state import STATE
+
+logger = logging.getLogger(__name__)
+
+'''
+shards.py
+    Splits a CSV input between several runner tasks, so a nightly run scales across machines.
+    - Each row belongs to shard hash(normalized handle) mod K. The hash is stable across
+      machines and runs, and every spelling of a channel ("@Name", a URL...) lands in the same shard.
+    - A task processes shard i of K when its parameters have SHARD_PARAMETER = i (1 to K) and
+      SHARDS_PARAMETER = K. Without them it processes the whole input.
+    - merge_results() combines the per-shard CSV_BotCity_task-*.csv outputs into one CSV in input
+      order, with one row per channel:
+        python -m framework.shards merge --input ./resources/input-channels.csv --output merged.csv ./results/*.csv
+'''
+
+SHARD_PARAMETER = "shard"
+SHARDS_PARAMETER = "shards"
+
+
+def shard_of(channel, shards: int) -> int:
+    """
+    Returns: Shard of the channel, from 0 to shards - 1.
+    """
+    digest = hashlib.blake2b(normalize_handle(channel).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % shards
+
+
+def task_shard() -> tuple:
+    """
+    Reads the shard of this task from its parameters.
+    Returns: (shard index from 0, shard count), or None to process the whole input.
+    """
+    parameters = getattr(STATE.execution, "parameters", None) or {}
+    if not parameters.get(SHARDS_PARAMETER):
+        return None
+    shards = int(parameters[SHARDS_PARAMETER])
+    shard = int(parameters.get(SHARD_PARAMETER, 1))
+    if not 1 <= shard <= shards:
+        raise ValueError(f"Task parameter {SHARD_PARAMETER}={shard} must be between 1 and {shards}.")
+    logger.info(f"Processing shard {shard} of {shards}.")
+    return shard - 1, shards
+
+
+def merge_results(result_files: list, output: str, input_file: str = None,
+                  key: str = "channel") -> int:
+    """
+    Merges result CSVs into one, with one row per channel (normalized handle of `key`).
+    A SUCCESS row wins over errors, then the latest TIMESTAMP.
+    Rows follow the first appearance of each channel in input_file, or their TIMESTAMP without it.
+    Returns: Number of rows written.
+    """
+    best = {}
+    header = []
+    for result_file in result_files:
+        with open(result_file, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            header += [column for column in reader.fieldnames or [] if column not in header]
+            for row in reader:
+                handle = normalize_handle(row.get(key, ""))
+                rank = (row.get("STATUS") == "SUCCESS", row.get("TIMESTAMP", ""))
+                current = best.get(handle)
+                if current is None or rank > current[0]:
+                    best[handle] = (rank, row)
+
+    if input_file:
+        order = []
+        placed = set()
+        opener = gzip.open if input_file.endswith(".gz") else open
+        with opener(input_file, "rt", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                handle = normalize_handle(row.get(key, ""))
+                if handle in best and handle not in placed:
+                    placed.add(handle)
+                    order.append(handle)
+        missing = sorted(best.keys() - placed, key=lambda handle: best[handle][1].get("TIMESTAMP", ""))
+        if missing:
+            logger.warning(f"{len(missing)} channels of the results are not in {input_file}. They are written last.")
+        order += missing
+    else:
+        order = sorted(best, key=lambda handle: best[handle][1].get("TIMESTAMP", ""))
+
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=header, extrasaction="ignore")
+        writer.writeheader()
+        for handle in order:
+            writer.writerow(best[handle][1])
+    logger.info(f"Merged {len(result_files)} result files into {output}: {len(order)} channels.")
+    return len(order)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merges the result CSVs of sharded tasks.")
+    parser.add_argument("command", choices=["merge"])
+    parser.add_argument("results", nargs="+", help="Result CSVs (glob patterns allowed).")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--input", help="Input CSV whose row order the merged result follows.")
+    parser.add_argument("--key", default="channel")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    files = sorted({path for pattern in args.results for path in glob.glob(pattern)})
+    merge_results(files, args.output, args.input, args.key)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 import logging
 import os
-from botcity.core import DesktopBot  # Import for Desktop Bot
+import threading
 from botcity.maestro import (AutomationTask, AutomationTaskFinishStatus,
                              BotMaestroSDK)
-from botcity.web import WebBot  # Import for Web Bot
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass
 from dotenv import load_dotenv
+from typing import TYPE_CHECKING
+from .exceptions import InterruptException
+if TYPE_CHECKING:
+    # Only for type hints: the bots are imported where they are instantiated (initialize.py)
+    from botcity.core import DesktopBot
+    from botcity.web import WebBot
 
 logger = logging.getLogger(__name__)
 
@@ -14,27 +19,108 @@ state.py
     Implements a state management system that works seamlessly with BotCity Orchestrator features.
     The State class maintains the execution state of automation tasks, providing features such as:
         - Count successful and failed items
-        - Check for interruption request
+        - Check for interruption request, polled in the background by TaskPoller
         - Stores WebBot(), DesktopBot() instances
+        - Keeps the current item and WebBot per thread, so parallel workers don't share them
         - And more
-    Authenticates the bot to connect with BotCity Orchestrator based on the environment:
+    STATE is created empty on import. STATE.connect(), called by bot.py before anything else,
+    authenticates the bot to connect with BotCity Orchestrator based on the environment:
         - BotCity Runner: Automatic authentication via system arguments.
         - Local with Orchestrator: Credentials from the .env file.
         - Local Test Mode: No authentication, uses mock objects.
 '''
 
 
+# Seconds between task refreshes of the TaskPoller. An interruption request is seen within this interval.
+TASK_POLL_INTERVAL = 5.0
+
+# Guards the counters shared by parallel workers
+_lock = threading.Lock()
+# Item and WebBot of the current thread
+_local = threading.local()
+
+
+class TaskPoller():
+    """
+    Refreshes the task from the BotCity Orchestrator on a background thread, so the interrupt
+    flag and the task info can be read from memory instead of with a request each time.
+    """
+
+    def __init__(self, maestro: BotMaestroSDK, task_id: str,
+                 interval: float = TASK_POLL_INTERVAL):
+        self.maestro = maestro
+        self.task_id = task_id
+        self.interval = interval
+        self.task = None
+        self.interrupted = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="task-poller", daemon=True)
+
+    def start(self):
+        """
+        Fetches the task once, then keeps refreshing it in the background.
+        """
+        self.refresh()
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def refresh(self):
+        """
+        Fetches the task. On errors the last known task is kept.
+        """
+        try:
+            task = self.maestro.get_task(self.task_id)
+            interrupted = bool(task.is_interrupted())
+        except Exception as ex:
+            logger.warning(f"Error refreshing the task {self.task_id}: {ex}")
+            return
+        with self._lock:
+            self.task = task
+            self.interrupted = interrupted
+
+    def stop(self):
+        self._stop.set()
+
+
 @dataclass
 class State:
     maestro: BotMaestroSDK = None
     task_id: str = ""
-    item: dict = field(default_factory=dict)
     success_count: int = 0
     error_count: int = 0
     has_error: bool = False
     has_success: bool = False
-    webbot: WebBot = None
-    desktopbot: DesktopBot = None
+    desktopbot: "DesktopBot" = None
+    # Not dataclass fields, so as_dict() doesn't copy them
+    execution = None
+    _poller = None
+
+    @property
+    def item(self) -> dict:
+        """
+        Item being processed by the current thread.
+        """
+        return getattr(_local, "item", {})
+
+    @item.setter
+    def item(self, value: dict):
+        _local.item = value
+
+    @property
+    def webbot(self) -> "WebBot":
+        """
+        WebBot owned by the current thread.
+        """
+        return getattr(_local, "webbot", None)
+
+    @webbot.setter
+    def webbot(self, value: "WebBot"):
+        _local.webbot = value
 
     @property
     def total_items(self):
@@ -48,15 +134,17 @@ class State:
         """
         Registers item success.
         """
-        self.has_success = True
-        self.success_count += 1
+        with _lock:
+            self.has_success = True
+            self.success_count += 1
 
     def register_error(self):
         """
         Registers item error.
         """
-        self.has_error = True
-        self.error_count += 1
+        with _lock:
+            self.has_error = True
+            self.error_count += 1
 
     def compute_finish_status(self) -> AutomationTaskFinishStatus:
         """
@@ -70,13 +158,79 @@ class State:
         else:
             return AutomationTaskFinishStatus.SUCCESS
 
+    def connect(self):
+        """
+        Connects to the BotCity Orchestrator based on the execution environment.
+        It checks if the bot is running in BotCity Runner environment or locally with/without authentication.
+        Only the first call connects, later calls do nothing.
+        Returns: State
+        """
+        if self.maestro is not None:
+            return self
+        load_dotenv()
+        server = os.getenv('SERVER')
+        login = os.getenv('LOGIN')
+        key = os.getenv('KEY')
+        task_id = os.getenv('TASK_ID')
+        try:
+            maestro = BotMaestroSDK.from_sys_args()
+            if maestro.server != '':
+                self.maestro = maestro
+                self.task_id = self.maestro.task_id
+                self.execution = self.maestro.get_execution(self.task_id)
+                print("\n ######### Bot is running in a BotCity Runner environment. \n")
+            elif all((server, login, key, task_id)):
+                # Set your credentials in the .env file order to run your bot locally
+                # with connection to the Orchestrator.
+                self.maestro = BotMaestroSDK()
+                self.maestro.login(
+                    server=server, login=login, key=key,)
+
+                self.task_id = task_id
+                self.execution = self.maestro.get_execution(self.task_id)
+                print("\n ######### Bot is running locally with connection to the Orchestrator. \n")
+            else:
+                raise Exception(
+                    "No valid .env configuration found. Set your credentials in the .env file order to run your bot locally.")
+        except Exception as e:
+            # If any error occurs, we assume the bot is running locally without
+            # authentication.
+            print(f"Error: {e}")
+            self.task_id = ""
+            self.maestro = BotMaestroSDK()
+            # Disable errors if we are not connected to the Orchestrator
+            self.maestro.RAISE_NOT_CONNECTED = False
+            # Opt-in to receive mock objects when not connected to the Orchestrator
+            self.maestro.MOCK_OBJECT_WHEN_DISCONNECTED = True
+            self.execution = self.maestro.get_execution(self.task_id)
+            print("\n ######### Bot is running in test mode (locally without authentication). \n")
+        return self
+
+    def start_task_poller(self, interval: float = TASK_POLL_INTERVAL):
+        """
+        Starts refreshing the task in the background. From then on, raise_for_interrupt_requested()
+        and task_info() read the last polled task instead of requesting it.
+        """
+        if self._poller:
+            return
+        self._poller = TaskPoller(self.maestro, self.task_id, interval)
+        self._poller.start()
+
+    def stop_task_poller(self):
+        if self._poller:
+            self._poller.stop()
+            self._poller = None
+
     def raise_for_interrupt_requested(self) -> bool:
         """
         Checks whether or not this task received an interrupt request.
         Returns: bool
         """
-        task_info = self.maestro.get_task(self.task_id)
-        if task_info.is_interrupted():
+        if self._poller:
+            interrupted = self._poller.interrupted
+        else:
+            interrupted = self.maestro.get_task(self.task_id).is_interrupted()
+        if interrupted:
             raise InterruptException("Interrupt requested via BotCity.")
         return False
 
@@ -85,6 +239,8 @@ class State:
         Returns details about a given task.
         Returns: AutomationTask
         """
+        if self._poller and self._poller.task:
+            return self._poller.task
         return self.maestro.get_task(self.task_id)
 
     def as_dict(self):
@@ -95,47 +251,5 @@ class State:
         return asdict(self)
 
 
-'''
-Initializes the STATE variable based on the execution environment.
-It checks if the bot is running in BotCity Runner environment or locally with/without authentication.
-Returns: STATE
-'''
-
-load_dotenv()
-SERVER = os.getenv('SERVER')
-LOGIN = os.getenv('LOGIN')
-KEY = os.getenv('KEY')
-TASK_ID = os.getenv('TASK_ID')
-try:
-    if BotMaestroSDK.from_sys_args().server != '':
-        STATE = State()
-        STATE.maestro = BotMaestroSDK.from_sys_args()
-        STATE.task_id = STATE.maestro.task_id
-        STATE.execution = STATE.maestro.get_execution(STATE.task_id)
-        print("\n ######### Bot is running in a BotCity Runner environment. \n")
-    elif all((SERVER, LOGIN, KEY, TASK_ID)):
-        # Set your credentials in the .env file order to run your bot locally
-        # with connection to the Orchestrator.
-        STATE = State()
-        STATE.maestro = BotMaestroSDK()
-        STATE.maestro.login(
-            server=SERVER, login=LOGIN, key=KEY,)
-
-        STATE.task_id = TASK_ID
-        STATE.execution = STATE.maestro.get_execution(STATE.task_id)
-        print("\n ######### Bot is running locally with connection to the Orchestrator. \n")
-    else:
-        raise Exception(
-            "No valid .env configuration found. Set your credentials in the .env file order to run your bot locally.")
-except Exception as e:
-    # If any error occurs, we assume the bot is running locally without
-    # authentication.
-    print(f"Error: {e}")
-    STATE = State()
-    STATE.maestro = BotMaestroSDK()
-    # Disable errors if we are not connected to the Orchestrator
-    STATE.maestro.RAISE_NOT_CONNECTED = False
-    # Opt-in to receive mock objects when not connected to the Orchestrator
-    STATE.maestro.MOCK_OBJECT_WHEN_DISCONNECTED = True
-    STATE.execution = STATE.maestro.get_execution(STATE.task_id)
-    print("\n ######### Bot is running in test mode (locally without authentication). \n")
+# Created empty, so importing the framework doesn't touch the network. See State.connect().
+STATE = State()
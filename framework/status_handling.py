@@ -1,8 +1,12 @@
-import datetime
 import logging
+import threading
 from .datasources import *
 from .finalize import *
+from .metrics import metrics
+from .reporting import reporter
+from .screenshots import screenshots
 from .state import STATE
+from .tracing import tracer
 from atexit import register
 from botcity.maestro import *
 
@@ -11,86 +15,102 @@ status_handling.py
     Provides exception handling, error reporting, and success registration for BotCity automation.
     Handles business exceptions, system exceptions, and interruption requests
     with alerting and screenshot capabilities.
+    Reporting is serialized, so the handlers can be called from parallel workers.
+    Orchestrator calls go through the reporting queue, so they don't block the item loop.
 '''
 
 logger = logging.getLogger(__name__)
-maestro = STATE.maestro
+_report_lock = threading.RLock()
 
 
 def handle_business_exception(exception: Exception):
-    STATE.register_error()
-    data_source.report_error("BUSINESS EXCEPTION", exception)
-    logger.error(
-        f"Business Exception {exception} occurred for item {STATE.item}.")
-    maestro.alert(
-        task_id=STATE.task_id,
-        title="Business Exception ocurred.",
-        message=f"Exception: {exception}, Item: {
-            STATE.item}.",
-        alert_type=AlertType.WARN)
-    screenshot_error_report(exception)
-    # You can add more steps here if needed!
-    # What should be done when a business exception occurs?
-    append_finish_status_message("Business Exception occurred during process.")
+    with _report_lock:
+        STATE.register_error()
+        with tracer.span("report"):
+            data_source.report_error("BUSINESS EXCEPTION", exception)
+        logger.error("Business Exception %s occurred for item %s.", exception, STATE.item)
+        with tracer.span("alert"):
+            reporter.alert(
+                STATE.maestro,
+                task_id=STATE.task_id,
+                title="Business Exception ocurred.",
+                message=f"Exception: {exception}, Item: {
+                    STATE.item}.",
+                alert_type=AlertType.WARN)
+        screenshot_error_report(exception)
+        # You can add more steps here if needed!
+        # What should be done when a business exception occurs?
+        append_finish_status_message("Business Exception occurred during process.")
+        tracer.finish_item("business_exception")
+        metrics.item_finished("business_exception", exception)
 
 
 def handle_system_exception(exception: Exception):
-    STATE.register_error()
-    data_source.report_error("SYSTEM EXCEPTION", exception)
-    logger.error(
-        f"System Exception {exception} occurred for item {STATE.item}.")
-    maestro.alert(
-        task_id=STATE.task_id,
-        title="System Exception ocurred.",
-        message=f"Check the logs for more information. Item: {
-            STATE.item}.",
-        alert_type=AlertType.ERROR)
-    screenshot_error_report(exception)
-    # You can add more steps here if needed!
-    # What should be done when a system exception occurs?
-    ...
+    with _report_lock:
+        STATE.register_error()
+        with tracer.span("report"):
+            data_source.report_error("SYSTEM EXCEPTION", exception)
+        logger.error("System Exception %s occurred for item %s.", exception, STATE.item)
+        with tracer.span("alert"):
+            reporter.alert(
+                STATE.maestro,
+                task_id=STATE.task_id,
+                title="System Exception ocurred.",
+                message=f"Check the logs for more information. Item: {
+                    STATE.item}.",
+                alert_type=AlertType.ERROR)
+        screenshot_error_report(exception)
+        # You can add more steps here if needed!
+        # What should be done when a system exception occurs?
+        ...
+        tracer.finish_item("system_exception")
+        metrics.item_finished("system_exception", exception)
 
 
 def handle_interrupt_requested(exception: Exception):
-    # The Automation will be stopped and end gracefully.
-    STATE.register_error()
-    data_source.report_error("INTERRUPTION REQUESTED", exception)
-    logger.warning(f"Interruption requested via the BotCity Orchestrator.")
-    maestro.alert(
-        task_id=STATE.task_id,
-        title="Interruption requested.",
-        message="Interruption requested via the BotCity Orchestrator. Check the logs for more information.",
-        alert_type=AlertType.WARN)
+    with _report_lock:
+        # The Automation will be stopped and end gracefully.
+        STATE.register_error()
+        with tracer.span("report"):
+            data_source.report_error("INTERRUPTION REQUESTED", exception)
+        logger.warning(f"Interruption requested via the BotCity Orchestrator.")
+        with tracer.span("alert"):
+            reporter.alert(
+                STATE.maestro,
+                task_id=STATE.task_id,
+                title="Interruption requested.",
+                message="Interruption requested via the BotCity Orchestrator. Check the logs for more information.",
+                alert_type=AlertType.WARN)
+        tracer.finish_item("interrupted")
+        metrics.item_finished("interrupted", exception)
 
     raise exception
 
 
 def screenshot_error_report(exception):
     """
-    Tries to save a screenshot and registers the error in the BotCity Orchestrator.
+    Registers the error in the BotCity Orchestrator, with a browser screenshot when the
+    screenshot policy allows it (see screenshots.py).
     Returns: None
     """
-    try:
-        date = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        screenshot_filepath = f".\\temp\\error-{date}.png"
-        STATE.desktopbot.save_screenshot(screenshot_filepath)
-        maestro.error(task_id=STATE.task_id, exception=exception,
-                      screenshot=screenshot_filepath)
-    except Exception as ex:
-        logger.error(f"Error: {ex}. Uploading error without a screenshot.")
-        # todo add extra tags item, etc.
-        maestro.error(task_id=STATE.task_id, exception=exception)
+    with tracer.span("screenshot"):
+        screenshots.report_error(exception)
 
 
-def register_success(message):
+def register_success(message, result=None):
     """
     Logs a successful item processing and records it in State and Datasource.
+    result is the structured result (e.g. ChannelResult) written to the columnar output, if any.
     """
-    logger.info(f"Item processing successful: item: {STATE.item}, {message}")
-    STATE.register_success()
-    data_source.report_success(message)
+    with _report_lock:
+        logger.info("Item processing successful: %s", message)
+        STATE.register_success()
+        with tracer.span("report"):
+            data_source.report_success(message, result)
 
-    # You can add more steps here if needed!
-    # According to your business logic, what else should be done when an item
-    # is processed successfully?
-    ...
+        # You can add more steps here if needed!
+        # According to your business logic, what else should be done when an item
+        # is processed successfully?
+        ...
+        tracer.finish_item("success")
+        metrics.item_finished("success")
@@ -0,0 +1,156 @@
+import datetime
+import json
+import logging
+import threading
+import time
+from .metrics import metrics
+from .readiness import percentile
+from .state import STATE
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+'''
+tracing.py
+    Times the phases of each item (interrupt check, browse, wait, reading the element, parsing,
+    data source reporting, alerts...) so a slow task shows whether YouTube, the browser or the
+    Orchestrator is to blame.
+    - tracer.span("phase") times a block and adds it to the record of the current thread's item.
+      The record is started by the first span or by start_item(), and written by finish_item().
+    - Each record is one JSON line in ./output/Trace_BotCity_task-{task_id}_date-{date}.jsonl,
+      so it is uploaded with the other result files.
+    - tracer.observe("phase", seconds) records timings that don't belong to an item, such as the
+      Orchestrator calls made by the reporting queue.
+    - summary_message() gives the percentiles per phase, added to the finish message.
+'''
+
+
+class Tracer():
+    def __init__(self, directory: str = "./output", item_key: str = "channel",
+                 history: int = 10000, flush_every: int = 100, enabled: bool = True):
+        """
+        Args:
+            directory: Folder of the trace file.
+            item_key: Item field written to each record to identify the item.
+            history: Timings kept per phase for the summary.
+            flush_every: Records written between flushes of the trace file.
+            enabled: False turns every span into a no-op.
+        """
+        self.directory = directory
+        self.item_key = item_key
+        self.history = history
+        self.flush_every = flush_every
+        self.enabled = enabled
+        self.records = 0
+        self.durations = {}
+        self._file = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def trace_file(self) -> str:
+        date = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M")
+        return str(Path(self.directory) / f"Trace_BotCity_task-{STATE.task_id}_date-{date}.jsonl")
+
+    def _current(self) -> dict:
+        record = getattr(self._local, "record", None)
+        if record is None:
+            record = {"started": time.perf_counter(),
+                      "start": datetime.datetime.now().isoformat(timespec="milliseconds"),
+                      "phases": {}}
+            self._local.record = record
+        return record
+
+    def start_item(self, item: dict):
+        """
+        Attaches the item to the record of the current thread.
+        """
+        if self.enabled:
+            self._current()["item"] = (item or {}).get(self.item_key)
+
+    @contextmanager
+    def span(self, phase: str):
+        """
+        Times the block as a phase of the current item. Repeated phases are added up.
+        """
+        if not self.enabled:
+            yield
+            return
+        record = self._current()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            phases = record["phases"]
+            phases[phase] = phases.get(phase, 0.0) + elapsed
+            self.observe(phase, elapsed)
+
+    def observe(self, phase: str, seconds: float):
+        """
+        Records a timing for the summary only.
+        """
+        if not self.enabled:
+            return
+        metrics.observe_phase(phase, seconds)
+        with self._lock:
+            if phase not in self.durations:
+                self.durations[phase] = deque(maxlen=self.history)
+            self.durations[phase].append(seconds)
+
+    def finish_item(self, outcome: str):
+        """
+        Writes the record of the current thread's item with its outcome.
+        """
+        if not self.enabled:
+            return
+        record = self._current()
+        self._local.record = None
+        line = {
+            "item": record.get("item"),
+            "thread": threading.current_thread().name,
+            "start": record["start"],
+            "outcome": outcome,
+            "total_ms": round((time.perf_counter() - record["started"]) * 1000, 2),
+            "phases": {phase: round(seconds * 1000, 2) for phase, seconds in record["phases"].items()},
+        }
+        try:
+            with self._lock:
+                if self._file is None:
+                    self._file = open(self.trace_file(), "a", encoding="utf-8")
+                self._file.write(json.dumps(line, separators=(",", ":")) + "\n")
+                self.records += 1
+                self._pending += 1
+                if self._pending >= self.flush_every:
+                    self._file.flush()
+                    self._pending = 0
+        except OSError as ex:
+            logger.error(f"Error writing the trace of item {record.get('item')}: {ex}")
+
+    def close(self):
+        """
+        Flushes and closes the trace file. Called by finalize() before the upload.
+        """
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+                logger.info(f"{self.records} item traces written.")
+
+    def summary_message(self) -> str:
+        """
+        Percentiles of each phase, in milliseconds.
+        """
+        with self._lock:
+            durations = {phase: list(values) for phase, values in self.durations.items()}
+        parts = []
+        for phase, values in durations.items():
+            values = [value * 1000 for value in values]
+            parts.append(
+                f"{phase} p50 {percentile(values, 50):.1f} / p95 {percentile(values, 95):.1f} / p99 {percentile(values, 99):.1f} ms (n={len(values)})")
+        return f"Phase timings: {'; '.join(parts)}." if parts else ""
+
+
+tracer = Tracer()
@@ -0,0 +1,197 @@
+import datetime
+import hashlib
+import logging
+import shutil
+import threading
+import time
+import zipfile
+from .state import STATE
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+'''
+uploads.py
+    Uploads the output folder to the BotCity Orchestrator as Result Files.
+    - mode "files": each file is its own artifact, uploaded by a pool of `workers` threads.
+    - mode "bundle": the whole folder is compressed into one zip artifact.
+    - Files whose content (SHA-256) was already uploaded under the same kind of artifact are skipped.
+    - With checkpoint_interval, the changed files are also uploaded during the run, as
+      "partial-<time>-<name>" artifacts, so the results of a process that dies aren't lost.
+      Partial uploads don't count for the final one: every file still ends up under its own name.
+'''
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactUploader():
+    def __init__(self, directory: str = "./output", mode: str = "files", workers: int = 4,
+                 checkpoint_interval: float = None, staging_dir: str = "./temp/uploads",
+                 max_retries: int = 2, backoff: float = 2.0):
+        """
+        Args:
+            directory: Folder uploaded.
+            mode: "files" (one artifact per file, uploaded concurrently) or "bundle" (one zip).
+            workers: Concurrent uploads in "files" mode.
+            checkpoint_interval: Seconds between uploads of the changed files during the run.
+                None uploads only in finalize().
+            staging_dir: Folder of the bundles and of the snapshots of files still being written.
+            max_retries: Retries of a failed upload.
+            backoff: Base delay between retries, in seconds.
+        """
+        self.directory = directory
+        self.mode = mode
+        self.workers = workers
+        self.checkpoint_interval = checkpoint_interval
+        self.staging_dir = staging_dir
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.uploaded = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes_uploaded = 0
+        # Last uploaded hash per ("partial" | "final", file name)
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._upload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def changed_files(self, checkpoint: bool = False) -> list:
+        """
+        Returns: (path, hash) of the files of the directory whose content wasn't uploaded yet,
+        as partial artifacts with checkpoint=True, under their own name otherwise.
+        """
+        kind = "partial" if checkpoint else "final"
+        changed = []
+        for path in sorted(Path(self.directory).glob("*")):
+            if not path.is_file():
+                continue
+            digest = file_sha256(path)
+            with self._lock:
+                if self._hashes.get((kind, path.name)) == digest:
+                    self.skipped += 1
+                    continue
+            changed.append((path, digest))
+        return changed
+
+    def upload_output(self, checkpoint: bool = False) -> int:
+        """
+        Uploads the files changed since the last upload.
+        Returns: Number of artifacts that failed to upload.
+        """
+        with self._upload_lock:
+            changed = self.changed_files(checkpoint)
+            if not changed:
+                logger.info("Result Files are up to date, nothing to upload.")
+                return 0
+            prefix = f"partial-{datetime.datetime.now().strftime('%H-%M-%S')}-" if checkpoint else ""
+            started = time.monotonic()
+            if self.mode == "bundle":
+                failed = self._upload_bundle(changed, prefix, checkpoint)
+            else:
+                failed = self._upload_files(changed, prefix, snapshot=checkpoint)
+            logger.info(
+                f"Uploaded {len(changed)} Result Files ({self.mode}) in {time.monotonic() - started:.1f}s. "
+                f"{self.stats_message()}")
+            return failed
+
+    def _upload_files(self, changed: list, prefix: str, snapshot: bool) -> int:
+        kind = "partial" if snapshot else "final"
+        def upload(entry):
+            path, digest = entry
+            source = path
+            if snapshot:
+                # The file may still be written: upload a copy taken now
+                source = Path(self.staging_dir) / f"{prefix}{path.name}"
+                source.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(path, source)
+            ok = self._post(f"{prefix}{path.name}", source)
+            if ok:
+                with self._lock:
+                    self._hashes[(kind, path.name)] = digest
+            return ok
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="upload") as pool:
+            results = list(pool.map(upload, changed))
+        return results.count(False)
+
+    def _upload_bundle(self, changed: list, prefix: str, checkpoint: bool) -> int:
+        kind = "partial" if checkpoint else "final"
+        date = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M")
+        bundle = Path(self.staging_dir) / f"{prefix}Output_BotCity_task-{STATE.task_id}_date-{date}.zip"
+        bundle.parent.mkdir(parents=True, exist_ok=True)
+        # The bundle holds the whole folder, so it is complete on its own
+        with zipfile.ZipFile(bundle, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+            for path in sorted(Path(self.directory).glob("*")):
+                if path.is_file():
+                    archive.write(path, path.name)
+        if not self._post(bundle.name, bundle):
+            return 1
+        with self._lock:
+            for path, digest in changed:
+                self._hashes[(kind, path.name)] = digest
+        return 0
+
+    def _post(self, artifact_name: str, filepath: Path) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                STATE.maestro.post_artifact(
+                    task_id=STATE.task_id,
+                    artifact_name=artifact_name,
+                    filepath=filepath
+                )
+            except Exception as ex:
+                if attempt == self.max_retries:
+                    logger.error(f"Error uploading {artifact_name} to BotCity Orchestrator: {ex}")
+                    with self._lock:
+                        self.failed += 1
+                    return False
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+            with self._lock:
+                self.uploaded += 1
+                self.bytes_uploaded += filepath.stat().st_size
+            return True
+
+    def start(self):
+        """
+        Starts the checkpoint uploads, when checkpoint_interval is set.
+        """
+        if not self.checkpoint_interval or self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="checkpoint-upload", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.checkpoint_interval):
+            try:
+                self.upload_output(checkpoint=True)
+            except Exception as ex:
+                logger.warning(f"Error uploading a checkpoint of the Result Files: {ex}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def stats_message(self) -> str:
+        return (f"Uploads: {self.uploaded} artifacts ({self.bytes_uploaded / 1024 ** 2:.1f} MB), "
+                f"{self.skipped} unchanged files skipped, {self.failed} failed.")
+
+
+"""
+Setting Uploads: files | bundle
+"""
+
+# checkpoint_interval=1800 also uploads the changed Result Files every 30 minutes during the run.
+uploader = ArtifactUploader(mode="files", workers=4, checkpoint_interval=None)
@@ -0,0 +1,110 @@
+import logging
+import threading
+from .datasources import data_source
+from .exceptions import BusinessException, InterruptException, SystemException
+from .finalize import cleanup
+from .initialize import init_desktopbot, init_webbot, run_once
+from .metrics import metrics
+from .process import process_item
+from .recovery import recovery
+from .retry import retry_scheduler
+from .state import STATE
+from .status_handling import (handle_business_exception,
+                              handle_interrupt_requested,
+                              handle_system_exception, register_success)
+
+logger = logging.getLogger(__name__)
+
+'''
+workers.py
+    Runs the item loop on a pool of worker threads, each one with its own WebBot session.
+    Every worker pulls items from the shared data source and follows the same exception
+    semantics as the loop in bot.py:
+        - BusinessException: the item is skipped.
+        - SystemException: the item is retried later (see retry.py) and only the browser of that
+          worker is recovered (see recovery.py).
+        - InterruptException: every worker stops after its current item.
+'''
+
+
+def run_worker_pool(workers: int):
+    """
+    Initializes the automation once and processes the data source with N parallel WebBot sessions.
+    Raises the InterruptException received by any worker once all of them have stopped.
+    """
+    STATE.raise_for_interrupt_requested()
+    run_once()
+    init_desktopbot()
+
+    stop = threading.Event()
+    interrupts = []
+    items = retry_scheduler.items(data_source)
+    threads = [
+        threading.Thread(target=worker, args=(items, stop, interrupts),
+                         name=f"worker-{n}")
+        for n in range(1, workers + 1)]
+    logger.info(f"Starting {workers} workers...")
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if interrupts:
+        raise interrupts[0]
+
+
+def worker(items, stop: threading.Event, interrupts: list):
+    """
+    Processes items from the data source until it is exhausted or an interruption is requested.
+    """
+    try:
+        init_webbot()
+        while not stop.is_set():
+            try:
+                item = next(items)
+            except StopIteration:
+                break
+
+            if stop.is_set():
+                # Fetched while another worker was stopping: give the item back unprocessed
+                data_source.report_error(
+                    "INTERRUPTION REQUESTED", "Not processed: interruption requested.")
+                break
+
+            metrics.item_started(item)
+            try:
+                result = process_item(item)
+            except InterruptException as ex:
+                stop.set()
+                try:
+                    handle_interrupt_requested(ex)
+                except InterruptException:
+                    interrupts.append(ex)
+            except BusinessException as ex:
+                retry_scheduler.record(item)
+                handle_business_exception(ex)
+                recovery.reset()
+            except (SystemException, Exception) as ex:
+                if not retry_scheduler.retry(item, ex):
+                    handle_system_exception(ex)
+                try:
+                    metrics.recovered(recovery.recover())
+                except InterruptException as ex:
+                    stop.set()
+                    interrupts.append(ex)
+            else:
+                retry_scheduler.record(item)
+                register_success(
+                    f"Item processed successfuly: {result}", result)
+                recovery.reset()
+            metrics.sample_browser(STATE.webbot)
+
+    except Exception as ex:
+        logger.error(f"Worker stopped: {ex}")
+
+    finally:
+        try:
+            cleanup()
+        except Exception:
+            ...
+        logger.info("Worker finished.")